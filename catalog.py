@@ -0,0 +1,173 @@
+import csv
+import os
+import sys
+
+########################
+# 0) Sources
+########################
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SPRITE_DIR = os.path.join(BASE_DIR, "pokemons")
+
+# Regional dex number + offset = national (global) ID, which is also the sprite file name
+HOENN_REGION = "hoenn"
+HOENN_ID_OFFSET = 251
+
+# (csv file, region name, ID offset); more regions (or one national dex with offset 0)
+# can be appended here or loaded later with add_source
+DEFAULT_SOURCES = [
+    (os.path.join(BASE_DIR, "hoenn_pokedex.csv"), HOENN_REGION, HOENN_ID_OFFSET),
+]
+
+EXPECTED_HEADER = ["id", "name", "type", "hp", "attack", "can evolve"]
+
+
+########################
+# 1) Streaming CSV Reader
+########################
+
+def parse_species_row(row, region, id_offset):
+    """
+    Turn one CSV row [ID, Name, Type, HP, Attack, Can Evolve] into a species dict.
+    Return (dict, None), or (None, error message) if the row is invalid.
+    """
+    if len(row) < 6:
+        return None, f"expected 6 columns, got {len(row)}"
+    try:
+        local_id = int(row[0])
+        hp = int(row[3])
+        attack = int(row[4])
+    except ValueError:
+        return None, "ID, HP and Attack must be whole numbers"
+    name = row[1].strip()
+    can_evolve = row[5].strip().upper()
+    if local_id <= 0 or hp < 0 or attack < 0:
+        return None, "ID must be positive, HP and Attack not negative"
+    if not name:
+        return None, "empty name"
+    if can_evolve not in ("TRUE", "FALSE"):
+        return None, f"Can Evolve must be TRUE or FALSE, got '{row[5]}'"
+    # interned, since thousands of rows share a handful of types
+    return {
+        "ID": local_id,
+        "Name": name,
+        "Type": sys.intern(row[2].strip()),
+        "HP": hp,
+        "Attack": attack,
+        "Can Evolve": sys.intern(can_evolve),
+        "Global ID": local_id + id_offset,
+        "Region": sys.intern(region),
+    }, None
+
+
+def iter_species_rows(filename, region, id_offset):
+    """
+    Read a dex CSV one row at a time (nothing but the current row is held in memory).
+    Yield (line number, species dict or None, error message or None). Blank rows are skipped.
+    """
+    with open(filename, mode='r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, delimiter=',')
+        header = next(reader, None)
+        if header is None:
+            return
+        if [column.strip().lower() for column in header[:6]] != EXPECTED_HEADER:
+            yield reader.line_num, None, f"unexpected header {header}"
+            return
+        for row in reader:
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            species, error = parse_species_row(row, region, id_offset)
+            yield reader.line_num, species, error
+
+
+########################
+# 2) Catalog
+########################
+
+def new_catalog():
+    """
+    Return an empty catalog dict:
+      'species': { global ID: species dict },
+      'regions': { region: { 'offset', 'list', 'by_id', 'by_name' } },
+      'errors':  [ "file:line: message", ... ]
+    """
+    return {'species': {}, 'regions': {}, 'errors': []}
+
+
+def add_source(catalog, filename, region, id_offset):
+    """
+    Stream one regional CSV into the catalog, indexing each row as it is read.
+    Invalid or clashing rows are skipped and recorded in catalog['errors'].
+    Return the number of species added.
+    """
+    region_index = catalog['regions'].setdefault(
+        region, {'offset': id_offset, 'list': [], 'by_id': {}, 'by_name': {}})
+    if region_index['offset'] != id_offset:
+        catalog['errors'].append(f"{filename}: region '{region}' already loaded with offset {region_index['offset']}")
+        return 0
+    added = 0
+    for line, species, error in iter_species_rows(filename, region, id_offset):
+        where = f"{os.path.basename(filename)}:{line}"
+        if error:
+            catalog['errors'].append(f"{where}: {error}")
+            continue
+        if species['Global ID'] in catalog['species']:
+            catalog['errors'].append(f"{where}: global ID {species['Global ID']} already used")
+            continue
+        if species['Name'] in region_index['by_name']:
+            catalog['errors'].append(f"{where}: name '{species['Name']}' already in {region}")
+            continue
+        catalog['species'][species['Global ID']] = species
+        region_index['list'].append(species)
+        region_index['by_id'][species['ID']] = species
+        region_index['by_name'][species['Name']] = species
+        added += 1
+    return added
+
+
+def load_catalog(sources=DEFAULT_SOURCES):
+    """
+    Build a catalog from (csv file, region name, ID offset) sources.
+    """
+    catalog = new_catalog()
+    for filename, region, id_offset in sources:
+        add_source(catalog, filename, region, id_offset)
+    return catalog
+
+
+def region_species(catalog, region):
+    """
+    Return the species of a region in file order (empty list if not loaded).
+    """
+    region_index = catalog['regions'].get(region)
+    return region_index['list'] if region_index else []
+
+
+def find_species(catalog, region, local_id):
+    """
+    Return the species dict for a regional dex number, or None.
+    """
+    region_index = catalog['regions'].get(region)
+    return region_index['by_id'].get(local_id) if region_index else None
+
+
+def find_species_by_name(catalog, region, name):
+    """
+    Return the species dict with this exact name in a region, or None.
+    """
+    region_index = catalog['regions'].get(region)
+    return region_index['by_name'].get(name) if region_index else None
+
+
+def find_global(catalog, global_id):
+    """
+    Return the species dict for a global (national) ID, or None.
+    """
+    return catalog['species'].get(global_id)
+
+
+def sprite_path(global_id, sprite_dir=SPRITE_DIR):
+    """
+    Return the sprite file for a global ID (it may not exist).
+    """
+    return os.path.join(sprite_dir, f"{global_id}.png")
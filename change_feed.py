@@ -0,0 +1,189 @@
+import json
+import threading
+
+########################
+# 0) Event Kinds
+########################
+
+# Every event is a dict {'seq': int, 'kind': str, 'owner': str, ...data}:
+#   create  -> 'poke_id', 'name', 'global_id' of the first Pokemon
+#   delete  -> no data
+#   add     -> 'poke_id', 'name', 'global_id' of the added Pokemon
+#   release -> 'poke_id', 'name', 'global_id' of the released Pokemon
+#   evolve  -> 'poke_id', 'name', 'global_id' of the old Pokemon, 'evolved_id',
+#              'already_present' (True if the evolution was there, so only the old one left)
+#   reset   -> owner is None; the whole state was replaced (e.g. a snapshot restore), so
+#              replicas must start again from a full export taken at or after this event
+CHANGE_CREATE = "create"
+CHANGE_DELETE = "delete"
+CHANGE_ADD = "add"
+CHANGE_RELEASE = "release"
+CHANGE_EVOLVE = "evolve"
+CHANGE_RESET = "reset"
+
+# full export lines (export_full): 'pokedex' -> list of {'poke_id', 'name', 'global_id'}
+CHANGE_SNAPSHOT = "snapshot"
+
+# owners always start with a Pokemon, so an empty pokedex is replayed by creating the
+# owner with this one and releasing it again
+EMPTY_POKEDEX_STARTER = "Treecko"
+
+
+########################
+# 1) Change Feed
+########################
+
+
+class ChangeFeed:
+    """
+    In-process feed of owner store changes with increasing sequence numbers (from 1).
+    Keeps the last max_events events so consumers can catch up with events_since();
+    subscribers are called for every event, in sequence order, while the feed's lock is
+    held, so callbacks should be quick and must not publish.
+    """
+
+    def __init__(self, max_events=100000):
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._events = []
+        # sequence number of self._events[0]
+        self._first_seq = 1
+        self._subscribers = []
+
+    def publish(self, kind, owner, **data):
+        """
+        Append an event and hand it to the subscribers. Return the event.
+        """
+        with self._lock:
+            return self._append(kind, owner, data)
+
+    def _append(self, kind, owner, data):
+        # caller holds self._lock
+        event = {'seq': self._first_seq + len(self._events), 'kind': kind, 'owner': owner}
+        event.update(data)
+        self._events.append(event)
+        # trim in bulk, so trimming costs O(1) per event on average
+        if len(self._events) >= 2 * self.max_events:
+            drop = len(self._events) - self.max_events
+            del self._events[:drop]
+            self._first_seq += drop
+        for callback in self._subscribers:
+            callback(event)
+        return event
+
+    def reset(self):
+        """
+        Publish a reset event and drop every event before it, so events_since() returns
+        None for any position before the reset. Return the reset event.
+        """
+        with self._lock:
+            event = self._append(CHANGE_RESET, None, {})
+            self._first_seq = event['seq'] + 1
+            self._events = []
+        return event
+
+    def subscribe(self, callback):
+        """
+        Call callback(event) for every future event. Return a function that unsubscribes.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def last_seq(self):
+        """
+        Return the sequence number of the latest event (0 if none yet).
+        """
+        with self._lock:
+            return self._first_seq + len(self._events) - 1
+
+    def events_since(self, seq, limit=None):
+        """
+        Return the events after seq (oldest first, at most limit), in O(number returned).
+        Return None if some of them were already trimmed; the consumer needs a full export.
+        """
+        with self._lock:
+            if seq + 1 < self._first_seq:
+                return None
+            start = max(0, seq + 1 - self._first_seq)
+            end = len(self._events) if limit is None else min(len(self._events), start + limit)
+            return self._events[start:end]
+
+
+########################
+# 2) Export & Replay
+########################
+
+
+def export_delta(feed, since_seq, filename):
+    """
+    Write the events after since_seq to filename as JSON lines. Return the last sequence
+    number written (since_seq if there was nothing new), to pass as since_seq next time,
+    or None if the feed no longer has those events (use export_full instead).
+    """
+    events = feed.events_since(since_seq)
+    if events is None:
+        return None
+    with open(filename, mode='w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+    return events[-1]['seq'] if events else since_seq
+
+
+def export_full(seq, owners, filename):
+    """
+    Write a full state export: one 'snapshot' line per (owner name, pokedex) pair, tagged
+    with seq, the feed position the state matches (see the stores' export_state()).
+    Return seq, so deltas can continue from it.
+    """
+    with open(filename, mode='w', encoding='utf-8') as f:
+        for owner, pokedex in owners:
+            line = {'seq': seq, 'kind': CHANGE_SNAPSHOT, 'owner': owner,
+                    'pokedex': [{'poke_id': pokemon['ID'], 'name': pokemon['Name'],
+                                 'global_id': pokemon['Global ID']} for pokemon in pokedex]}
+            f.write(json.dumps(line) + "\n")
+    return seq
+
+
+def read_export(filename):
+    """
+    Return the events / snapshot lines of an export file as a list of dicts.
+    """
+    with open(filename, mode='r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def apply_event(store, event):
+    """
+    Replay one change event (or full export line) on a store (a replica), through its
+    normal operations. Raises ValueError for a reset event: the replica has to be
+    rebuilt from a full export.
+    """
+    kind = event['kind']
+    owner = event['owner']
+    if kind == CHANGE_CREATE:
+        store.create_owner(owner, event['name'])
+    elif kind == CHANGE_DELETE:
+        store.delete_owner(owner)
+    elif kind == CHANGE_ADD:
+        store.add_pokemon(owner, event['poke_id'])
+    elif kind == CHANGE_RELEASE:
+        store.release_pokemon(owner, event['name'])
+    elif kind == CHANGE_EVOLVE:
+        store.evolve_pokemon(owner, event['name'])
+    elif kind == CHANGE_RESET:
+        raise ValueError(f"state was reset at seq {event['seq']}, a full export is needed")
+    elif kind == CHANGE_SNAPSHOT:
+        pokedex = event['pokedex']
+        if not pokedex:
+            store.create_owner(owner, EMPTY_POKEDEX_STARTER)
+            store.release_pokemon(owner, EMPTY_POKEDEX_STARTER)
+            return
+        store.create_owner(owner, pokedex[0]['name'])
+        for pokemon in pokedex[1:]:
+            store.add_pokemon(owner, pokemon['poke_id'])
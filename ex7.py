@@ -1,7 +1,13 @@
-import csv
+import base64
+from collections import deque
+
+import catalog
+import change_feed
 
 # Global BST root
 ownerRoot = None
+# Changes made through the menus, for exports / other consumers
+OWNER_FEED = change_feed.ChangeFeed()
 
 # 'defines' for getting rid of magic numbers
 
@@ -34,6 +40,22 @@ PRINT_OWNER_BFS = 1
 PRINT_OWNER_PRE = 2
 PRINT_OWNER_IN = 3
 PRINT_OWNER_POST = 4
+PRINT_OWNER_BROWSE = 5
+
+# Browse owners sub-menu options
+BROWSE_NEXT = 1
+BROWSE_JUMP = 2
+BROWSE_BACK = 3
+
+# Results for the non-interactive owner / pokedex operations
+RESULT_OK = 0
+RESULT_NOT_FOUND = 1
+RESULT_DUPLICATE = 2
+RESULT_CANNOT_EVOLVE = 3
+RESULT_NO_OWNER = 4
+
+# Starter choices (menu number -> Pokemon name)
+STARTERS = {1: "Treecko", 2: "Torchic", 3: "Mudkip"}
 
 ########################
 # 0) Read from CSV -> HOENN_DATA
@@ -44,35 +66,20 @@ def read_hoenn_csv(filename):
     """
     Reads 'hoenn_pokedex.csv' and returns a list of dicts:
       [ { "ID": int, "Name": str, "Type": str, "HP": int,
-          "Attack": int, "Can Evolve": "TRUE"/"FALSE" },
+          "Attack": int, "Can Evolve": "TRUE"/"FALSE",
+          "Global ID": int, "Region": "hoenn" },
         ... ]
+    Blank rows are skipped and invalid rows left out (see catalog.iter_species_rows).
     """
-    data_list = []
-    with open(filename, mode='r', encoding='utf-8') as f:
-        reader = csv.reader(f, delimiter=',')  # Use comma as the delimiter
-        first_row = True
-        for row in reader:
-            # It's the header row (like ID,Name,Type,HP,Attack,Can Evolve), skip it
-            if first_row:
-                first_row = False
-                continue
-
-            # row => [ID, Name, Type, HP, Attack, Can Evolve]
-            if not row or not row[0].strip():
-                break  # Empty or invalid row => stop
-            d = {
-                "ID": int(row[0]),
-                "Name": str(row[1]),
-                "Type": str(row[2]),
-                "HP": int(row[3]),
-                "Attack": int(row[4]),
-                "Can Evolve": str(row[5]).upper()
-            }
-            data_list.append(d)
-    return data_list
+    return [species for _, species, _ in catalog.iter_species_rows(filename, catalog.HOENN_REGION, catalog.HOENN_ID_OFFSET)
+            if species]
 
 
-HOENN_DATA = read_hoenn_csv("hoenn_pokedex.csv")
+# All loaded regions, indexed by regional ID, name and global ID.
+# The menus work on one region; its IDs are the ones users type in.
+CATALOG = catalog.load_catalog()
+ACTIVE_REGION = catalog.HOENN_REGION
+HOENN_DATA = catalog.region_species(CATALOG, ACTIVE_REGION)
 
 ########################
 # 1) Helper Functions
@@ -110,21 +117,15 @@ def read_int_safe(prompt):
 
 def get_poke_dict_by_id(poke_id):
     """
-    Return a copy of the Pokemon dict from HOENN_DATA by ID, or None if not found.
+    Return the Pokemon dict of the active region by ID, or None if not found.
     """
-    for poke_dict in HOENN_DATA:
-        if poke_dict["ID"] == poke_id:
-            return poke_dict
-    return None
+    return catalog.find_species(CATALOG, ACTIVE_REGION, poke_id)
 
 def get_poke_dict_by_name(name):
     """
-    Return a copy of the Pokemon dict from HOENN_DATA by name, or None if not found.
+    Return the Pokemon dict of the active region by name, or None if not found.
     """
-    for poke_dict in HOENN_DATA:
-        if poke_dict["Name"] == name:
-            return poke_dict
-    return None
+    return catalog.find_species_by_name(CATALOG, ACTIVE_REGION, name)
 
 def display_pokemon_list(poke_list):
     """
@@ -140,25 +141,76 @@ def display_pokemon_list(poke_list):
         print(f"ID: {pokemon['ID']}, Name: {pokemon['Name']}, Type: {pokemon['Type']}, HP: {pokemon['HP']}, Attack: {pokemon['Attack']}, Can Evolve: {pokemon['Can Evolve']}")
 
 
+def filter_certain_type(poke_list, type_choice):
+    """
+    Return only Pokemon of a certain type (case insensitive).
+    """
+    return [pokemon for pokemon in poke_list if pokemon['Type'].lower() == type_choice.lower()]
+
+def filter_evolvable(poke_list, _=None):
+    """
+    Return only Pokemon that can evolve.
+    """
+    return [pokemon for pokemon in poke_list if pokemon['Can Evolve'] == "TRUE"]
+
+def filter_attack_above(poke_list, attack_choice):
+    """
+    Return only Pokemon with an attack above a certain value.
+    """
+    return [pokemon for pokemon in poke_list if pokemon['Attack'] > attack_choice]
+
+def filter_hp_above(poke_list, hp_choice):
+    """
+    Return only Pokemon with HP above a certain value.
+    """
+    return [pokemon for pokemon in poke_list if pokemon['HP'] > hp_choice]
+
+def filter_name_starts(poke_list, name_choice):
+    """
+    Return only Pokemon whose name starts with a certain letter(s) (case insensitive).
+    """
+    return [pokemon for pokemon in poke_list if pokemon['Name'].lower().startswith(name_choice.lower())]
+
+def filter_all(poke_list, _=None):
+    """
+    Return all Pokemon (a copy of the list).
+    """
+    return list(poke_list)
+
+# display filter menu option -> filter function
+POKEDEX_FILTERS = {
+    DISP_CERTAIN_TYPE: filter_certain_type,
+    DISP_EVOLVABLE: filter_evolvable,
+    DISP_ATTACK_ABOVE: filter_attack_above,
+    DISP_HP_ABOVE: filter_hp_above,
+    DISP_NAME_STARTS: filter_name_starts,
+    DISP_ALL: filter_all,
+}
+
+def filter_pokedex(poke_list, choice, value=None):
+    """
+    Apply the filter for a display menu option to a pokedex. Return the matching list,
+    or None if the option is not a filter.
+    """
+    filter_funct = POKEDEX_FILTERS.get(choice)
+    if filter_funct is None:
+        return None
+    return filter_funct(poke_list, value)
+
 def display_certian_type(poke_list):
     """
     Display only Pokemon of a certain type.
     """
     # get type from user
     type_choice = input("Which Type? (e.g. GRASS, WATER): ")
-    # create list of Pokemon that match the type (cast to lower so case insensitive)
-    type_list = [pokemon for pokemon in poke_list if pokemon['Type'].lower() == type_choice.lower()]
-    # display the list
-    display_pokemon_list(type_list)
+    # display the list of Pokemon that match the type
+    display_pokemon_list(filter_certain_type(poke_list, type_choice))
 
 def display_evolvable(poke_list):
     """
     Display only Pokemon that can evolve.
     """
-    # create list of Pokemon that can evolve
-    evolve_list = [pokemon for pokemon in poke_list if pokemon['Can Evolve'] == "TRUE"]
-    # display the list
-    display_pokemon_list(evolve_list)
+    display_pokemon_list(filter_evolvable(poke_list))
 
 def display_atack_above(poke_list):
     """
@@ -166,10 +218,8 @@ def display_atack_above(poke_list):
     """
     # get attack value from user
     attack_choice = read_int_safe("Enter Attack threshold: ")
-    # create list of Pokemon with attack above the value
-    attack_list = [pokemon for pokemon in poke_list if pokemon['Attack'] > attack_choice]
-    # display the list
-    display_pokemon_list(attack_list)
+    # display the list of Pokemon with attack above the value
+    display_pokemon_list(filter_attack_above(poke_list, attack_choice))
 
 def display_hp_above(poke_list):
     """
@@ -177,10 +227,8 @@ def display_hp_above(poke_list):
     """
     # get HP value from user
     hp_choice = read_int_safe("Enter HP threshold: ")
-    # create list of Pokemon with HP above the value
-    hp_list = [pokemon for pokemon in poke_list if pokemon['HP'] > hp_choice]
-    # display the list
-    display_pokemon_list(hp_list)
+    # display the list of Pokemon with HP above the value
+    display_pokemon_list(filter_hp_above(poke_list, hp_choice))
 
 def display_name_starts(poke_list):
     """
@@ -188,10 +236,8 @@ def display_name_starts(poke_list):
     """
     # get starting letters from user
     name_choice = input("Starting letter(s): ")
-    # create list of Pokemon with names starting with the letters
-    name_list = [pokemon for pokemon in poke_list if pokemon['Name'].lower().startswith(name_choice.lower())]
-    # display the list
-    display_pokemon_list(name_list)
+    # display the list of Pokemon with names starting with the letters
+    display_pokemon_list(filter_name_starts(poke_list, name_choice))
 
 ########################
 # 2) BST (By Owner Name)
@@ -213,38 +259,47 @@ def create_owner_logic():
     # next, get starter choice and assign name as string
     print("Choose your starter Pokemon:\n1) Treecko\n2) Torchic\n3) Mudkip")
     starter_choice = read_int_safe("Your choice: ")
-    if starter_choice == 1:
-        choice_name = "Treecko"
-        pass
-    elif starter_choice == 2:
-        choice_name = "Torchic"
-        pass
-    elif starter_choice == 3:
-        choice_name = "Mudkip"
-        pass
-    else:
-        # edge case: invalid choice number, return without creating new owner
+    # edge case: invalid choice number, return without creating new owner
+    if starter_choice not in STARTERS:
         print("Invalid. No new Pokedex created.")
         return
+    choice_name = STARTERS[starter_choice]
     # create the node
     owner_node = create_owner_node(new_owner_name, get_poke_dict_by_name(choice_name))
     # insert new owner node into BST
     ownerRoot = insert_owner_bst(ownerRoot, owner_node)
+    publish_change(OWNER_FEED, change_feed.CHANGE_CREATE, new_owner_name, (RESULT_OK, owner_node['pokedex'][0]))
     # print success message
     print(f"New Pokedex created for {new_owner_name} with starter {choice_name}.")
 
 
 def create_owner_node(owner_name, first_pokemon=None):
     """
-    Create and return a BST node dict with keys: 'owner', 'pokedex', 'left', 'right'.
+    Create and return a BST node dict with keys: 'owner', 'pokedex', 'left', 'right', 'size'.
     """
     # create dict (BST node) with owner name, pokedex, and left/right as None
+    # 'size' is the number of nodes in this subtree (used for paging by position)
     owner_dict = {'owner': owner_name, 
                  'pokedex': [first_pokemon],
                  'left': None,
-                 'right': None}
+                 'right': None,
+                 'size': 1}
     return owner_dict
 
+def owner_size(node):
+    """
+    Return the number of nodes in a subtree (0 for None).
+    """
+    if node == None:
+        return 0
+    return node['size']
+
+def update_size(node):
+    """
+    Recompute a node's 'size' from its children's sizes.
+    """
+    node['size'] = 1 + owner_size(node['left']) + owner_size(node['right'])
+
 def insert_owner_bst(root, new_node):
     """
     Insert a new BST node by owner_name (alphabetically). Return updated root.
@@ -259,7 +314,8 @@ def insert_owner_bst(root, new_node):
     # if new node's owner name is greater than root's owner name, insert right
     elif new_node['owner'].lower() > root['owner'].lower():
         root['right'] = insert_owner_bst(root['right'], new_node)
-    # now that we've inserted, return the root
+    # now that we've inserted, fix the subtree size and return the root
+    update_size(root)
     return root
     
 
@@ -267,22 +323,18 @@ def find_owner_bst(root, owner_name):
     """
     Locate a BST node by owner_name. Return that node or None if missing.
     """
-    # must check both sides, as because of capital letters, we don't necessarily know bigger or smaller
-    # if root is empty, return None
-    if root == None:
-        return None
-    # if owner name is the same as root's owner name, return root
-    if owner_name.lower() == root['owner'].lower():
-        return root
-    # check BOTH sides to account for edge case in capital letters
-    # get left side recursive, if exists, ie not None, return it
-    left_side = find_owner_bst(root['left'], owner_name)
-    if left_side:
-        return left_side
-    # get right side recursive, if exists, ie not None, return it
-    right_side = find_owner_bst(root['right'], owner_name)
-    if right_side:
-        return right_side
+    # the tree is ordered by lowercase owner name (see insert_owner_bst),
+    # so compare lowercase names and only walk down one side
+    owner_name = owner_name.lower()
+    current = root
+    while current != None:
+        current_name = current['owner'].lower()
+        if owner_name == current_name:
+            return current
+        if owner_name < current_name:
+            current = current['left']
+        else:
+            current = current['right']
     # if here, then no owner found, return None
     return None
 
@@ -305,11 +357,15 @@ def delete_owner_logic():
             return
         # first check if to delete owner is in tree, if not, print message and return
         owner_to_delete = input("Enter owner to delete: ")
-        if not find_owner_bst(ownerRoot, owner_to_delete):
+        owner_node = find_owner_bst(ownerRoot, owner_to_delete)
+        if not owner_node:
             print(f"Owner '{owner_to_delete}' not found.")
             return
+        # remember the stored name before the node's data can move
+        stored_name = owner_node['owner']
         print(f"Deleting {owner_to_delete}'s entire Pokedex...")
         ownerRoot = delete_owner_bst(ownerRoot, owner_to_delete)
+        publish_change(OWNER_FEED, change_feed.CHANGE_DELETE, stored_name)
         print("Pokedex deleted.")
 
 
@@ -317,7 +373,7 @@ def delete_owner_bst(root, owner_name):
     """
     Remove a node from the BST by owner_name. Return updated root.
     """
-    # recursively find owner: cannot rely on capital letters, so must check both sides
+    # recursively find owner, ordered by lowercase name like insert_owner_bst
     # if root is empty, return None
     if root == None:
         return None
@@ -336,10 +392,14 @@ def delete_owner_bst(root, owner_name):
         root['owner'] = min_right['owner']
         root['pokedex'] = min_right['pokedex']
         root['right'] = delete_owner_bst(root['right'], min_right['owner'])
+        update_size(root)
         return root
-    # check BOTH sides to account for edge case in capital letters
-    root['left'] = delete_owner_bst(root['left'], owner_name)
-    root['right'] = delete_owner_bst(root['right'], owner_name)
+    # otherwise only the side that can hold the name
+    if owner_name.lower() < root['owner'].lower():
+        root['left'] = delete_owner_bst(root['left'], owner_name)
+    else:
+        root['right'] = delete_owner_bst(root['right'], owner_name)
+    update_size(root)
     return root
 
 
@@ -432,28 +492,294 @@ def post_order(root):
 
 
 
+def bfs_nodes(root):
+    """
+    Yield BST nodes in BFS level-order (iterative, no printing).
+    """
+    if not root:
+        return
+    queue = deque([root])
+    while queue:
+        current = queue.popleft()
+        yield current
+        if current['left']:
+            queue.append(current['left'])
+        if current['right']:
+            queue.append(current['right'])
+
+def pre_order_nodes(root):
+    """
+    Yield BST nodes in pre-order (iterative, so deep trees don't hit the recursion limit).
+    """
+    stack = [root] if root else []
+    while stack:
+        current = stack.pop()
+        yield current
+        # push right first so left comes out first
+        if current['right']:
+            stack.append(current['right'])
+        if current['left']:
+            stack.append(current['left'])
+
+def in_order_nodes(root):
+    """
+    Yield BST nodes in in-order, i.e. alphabetically by owner name (iterative).
+    """
+    stack = []
+    current = root
+    while stack or current:
+        # go as far left as possible, then visit, then go right
+        while current:
+            stack.append(current)
+            current = current['left']
+        current = stack.pop()
+        yield current
+        current = current['right']
+
+def post_order_nodes(root):
+    """
+    Yield BST nodes in post-order (iterative).
+    """
+    stack = [(root, False)] if root else []
+    while stack:
+        current, children_done = stack.pop()
+        if children_done:
+            yield current
+            continue
+        stack.append((current, True))
+        if current['right']:
+            stack.append((current['right'], False))
+        if current['left']:
+            stack.append((current['left'], False))
+
+def range_owner_nodes(root, low=None, high=None, after=None):
+    """
+    Yield nodes in alphabetical order whose lowercase owner name is >= low, <= high and
+    > after (each bound optional, given lowercase). Subtrees outside the range are
+    skipped, so this costs O(tree height + number of nodes yielded).
+    """
+    stack = []
+    current = root
+    while stack or current:
+        # go left as far as the range allows; a node below the range means its whole
+        # left subtree is too, so jump to its right child instead
+        while current:
+            name = current['owner'].lower()
+            if (low is not None and name < low) or (after is not None and name <= after):
+                current = current['right']
+            else:
+                stack.append(current)
+                current = current['left']
+        if not stack:
+            return
+        current = stack.pop()
+        if high is not None and current['owner'].lower() > high:
+            return
+        yield current
+        current = current['right']
+
+def owner_nodes_from_index(root, index):
+    """
+    Yield nodes in alphabetical order starting at position index (0 based), in
+    O(tree height + number of nodes yielded) using the subtree sizes.
+    """
+    # find the start node, remembering the ancestors that come after it
+    stack = []
+    current = root
+    while current:
+        left_size = owner_size(current['left'])
+        if index < left_size:
+            stack.append(current)
+            current = current['left']
+        elif index == left_size:
+            stack.append(current)
+            break
+        else:
+            index -= left_size + 1
+            current = current['right']
+    # then carry on in-order from there
+    while stack:
+        current = stack.pop()
+        yield current
+        current = current['right']
+        while current:
+            stack.append(current)
+            current = current['left']
+
+def encode_owner_cursor(owner_name):
+    """
+    Return an opaque cursor meaning "continue after this owner".
+    """
+    return base64.urlsafe_b64encode(owner_name.lower().encode('utf-8')).decode('ascii')
+
+def decode_owner_cursor(cursor):
+    """
+    Return the lowercase owner name inside a cursor made by encode_owner_cursor.
+    """
+    return base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+
+def check_scan_limit(limit):
+    """
+    Raise ValueError unless limit is None (no limit) or a whole number >= 1.
+    """
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        raise ValueError(f"limit must be a whole number >= 1, got {limit!r}")
+
+def check_page_args(page_number, page_size):
+    """
+    Raise ValueError unless page_number >= 0 and page_size >= 1 are whole numbers.
+    """
+    for name, value, minimum in (("page", page_number, 0), ("size", page_size, 1)):
+        if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+            raise ValueError(f"{name} must be a whole number >= {minimum}, got {value!r}")
+
+def scan_owners(root, low=None, high=None, cursor=None, limit=None):
+    """
+    Return (nodes, next_cursor): up to limit nodes alphabetically between low and high
+    (inclusive, case insensitive), continuing after cursor if given. next_cursor is
+    None once the range is exhausted. Raises ValueError if limit is below 1.
+    """
+    check_scan_limit(limit)
+    low = low.lower() if low is not None else None
+    high = high.lower() if high is not None else None
+    after = decode_owner_cursor(cursor) if cursor else None
+    nodes = []
+    for node in range_owner_nodes(root, low, high, after):
+        # one extra node tells us whether there is another page
+        if limit is not None and len(nodes) == limit:
+            return nodes, encode_owner_cursor(nodes[-1]['owner'])
+        nodes.append(node)
+    return nodes, None
+
+def owners_page(root, page_number, page_size):
+    """
+    Return the nodes on page page_number (0 based) of size page_size, alphabetically.
+    Raises ValueError for a negative page or a size below 1.
+    """
+    check_page_args(page_number, page_size)
+    nodes = []
+    for node in owner_nodes_from_index(root, page_number * page_size):
+        if len(nodes) == page_size:
+            break
+        nodes.append(node)
+    return nodes
+
+# print all menu option -> node generator
+TRAVERSALS = {
+    PRINT_OWNER_BFS: bfs_nodes,
+    PRINT_OWNER_PRE: pre_order_nodes,
+    PRINT_OWNER_IN: in_order_nodes,
+    PRINT_OWNER_POST: post_order_nodes,
+}
+
+
 ########################
 # 4) Pokedex Operations
 ########################
 
+def add_pokemon_by_id(owner_node, poke_id):
+    """
+    Add the Pokemon with this ID to the owner's pokedex if not duplicate.
+    Return (result, pokemon dict or None).
+    """
+    pokemon_to_add = get_poke_dict_by_id(poke_id)
+    # if the Pokemon is not found, nothing to add
+    if not pokemon_to_add:
+        return RESULT_NOT_FOUND, None
+    # if the Pokemon is already in the pokedex, no changes
+    if pokemon_to_add in owner_node['pokedex']:
+        return RESULT_DUPLICATE, pokemon_to_add
+    owner_node['pokedex'].append(pokemon_to_add)
+    return RESULT_OK, pokemon_to_add
+
+def release_pokemon(owner_node, name_choice):
+    """
+    Remove the first Pokemon with this name (case insensitive) from the owner's pokedex.
+    Return (result, released pokemon dict or None).
+    """
+    # iterate over list till find the name, then remove it
+    for pokemon in owner_node['pokedex']:
+        if pokemon['Name'].lower() == name_choice.lower():
+            owner_node['pokedex'].remove(pokemon)
+            return RESULT_OK, pokemon
+    return RESULT_NOT_FOUND, None
+
+def evolve_pokemon(owner_node, name_choice):
+    """
+    Evolve the first Pokemon with this name (case insensitive) in the owner's pokedex.
+    Return (result, old pokemon dict, evolution dict):
+    RESULT_OK if replaced by its evolution, RESULT_DUPLICATE if the evolution was
+    already present (old one is removed), RESULT_CANNOT_EVOLVE (also when the data has
+    no next ID to evolve into) or RESULT_NOT_FOUND.
+    """
+    # 4 cases: not found, cannot evolve, evolution in list, and evolution not in list
+    for pokemon in owner_node['pokedex']:
+        if pokemon['Name'].lower() == name_choice.lower():
+            # case: cannot evolve
+            if pokemon['Can Evolve'] == "FALSE":
+                return RESULT_CANNOT_EVOLVE, pokemon, None
+            # evolution is always the next ID
+            evolution = get_poke_dict_by_id(pokemon['ID'] + 1)
+            # case: marked as evolvable but the next ID isn't in the data, leave it as is
+            if evolution is None:
+                return RESULT_CANNOT_EVOLVE, pokemon, None
+            # case: evolution in list, only remove old
+            if evolution in owner_node['pokedex']:
+                owner_node['pokedex'].remove(pokemon)
+                return RESULT_DUPLICATE, pokemon, evolution
+            # case: evolution not in list, remove old, add new
+            owner_node['pokedex'].remove(pokemon)
+            owner_node['pokedex'].append(evolution)
+            return RESULT_OK, pokemon, evolution
+    # case: not found
+    return RESULT_NOT_FOUND, None, None
+
+def change_event_data(kind, outcome):
+    """
+    Return the change feed data (see change_feed) for an operation's outcome:
+    (result, pokemon) for create / add / release, (result, pokemon, evolution) for evolve.
+    Return None if the outcome changed nothing.
+    """
+    if kind == change_feed.CHANGE_DELETE:
+        return {}
+    result, pokemon = outcome[0], outcome[1]
+    if kind == change_feed.CHANGE_EVOLVE:
+        # a duplicate evolution still removed the old Pokemon
+        if result not in (RESULT_OK, RESULT_DUPLICATE):
+            return None
+        return {'poke_id': pokemon['ID'], 'name': pokemon['Name'], 'global_id': pokemon['Global ID'],
+                'evolved_id': outcome[2]['ID'], 'already_present': result == RESULT_DUPLICATE}
+    if result != RESULT_OK:
+        return None
+    return {'poke_id': pokemon['ID'], 'name': pokemon['Name'], 'global_id': pokemon['Global ID']}
+
+def publish_change(feed, kind, owner_name, outcome=None):
+    """
+    Publish a change event for an owner if the outcome changed something (no-op without a feed).
+    """
+    if feed is None:
+        return
+    data = change_event_data(kind, outcome)
+    if data is not None:
+        feed.publish(kind, owner_name, **data)
+
 def add_pokemon_to_owner(owner_node):
     """
     Prompt user for a Pokemon ID, find the data, and add to this owner's pokedex if not duplicate.
     """
     # first, get the ID of the Pokemon to add
     ID_choice = read_int_safe("Enter Pokemon ID to add: ")
-    # next, get the Pokemon dict by ID
-    pokemon_to_add = get_poke_dict_by_id(ID_choice)
+    result, pokemon_to_add = add_pokemon_by_id(owner_node, ID_choice)
+    publish_change(OWNER_FEED, change_feed.CHANGE_ADD, owner_node['owner'], (result, pokemon_to_add))
     # if the Pokemon is not found, print message and return
-    if not pokemon_to_add:
+    if result == RESULT_NOT_FOUND:
         print(f"ID {ID_choice} not found in Honen data.")
         return
     # if the Pokemon is already in the pokedex, print message and return
-    if pokemon_to_add in owner_node['pokedex']:
+    if result == RESULT_DUPLICATE:
         print(f"Pokemon already in the list. No changes made.")
         return
-    # if the Pokemon is not in the pokedex, add it and print success message
-    owner_node['pokedex'].append(pokemon_to_add)
+    # if the Pokemon was added, print success message
     print(f"Pokemon {pokemon_to_add['Name']} (ID {pokemon_to_add['ID']}) added to {owner_node['owner']}'s Pokedex.")
 
 
@@ -464,12 +790,11 @@ def release_pokemon_by_name(owner_node):
     
     # get the name of the Pokemon to release
     name_choice = input("Enter Pokemon Name to release: ")
-    # iterate over list till find the name, then remove it
-    for pokemon in owner_node['pokedex']:
-        if pokemon['Name'].lower() == name_choice.lower():
-            print(f"Releasing {pokemon['Name']} from {owner_node['owner']}.")
-            owner_node['pokedex'].remove(pokemon)
-            return
+    result, pokemon = release_pokemon(owner_node, name_choice)
+    publish_change(OWNER_FEED, change_feed.CHANGE_RELEASE, owner_node['owner'], (result, pokemon))
+    if result == RESULT_OK:
+        print(f"Releasing {pokemon['Name']} from {owner_node['owner']}.")
+        return
     # if not found, print message and return
     print(f"No Pokemon named '{name_choice}' in {owner_node['owner']}'s Pokedex.")
 
@@ -484,31 +809,20 @@ def evolve_pokemon_by_name(owner_node):
     """
     # get name of pokemon to evolve
     name_choice = input("Enter Pokemon Name to evolve: ")
-    # 4 cases: not found, cannot evolve, evolution in list, and evolution not in list
-    # iterate over list till find the name, then remove it
-    for pokemon in owner_node['pokedex']:
-        if pokemon['Name'].lower() == name_choice.lower():
-            # case: cannot evolve: print message and return
-            if pokemon['Can Evolve'] == "FALSE":
-                print(f"{pokemon['Name']} cannot evolve.")
-                return
-            # 2 cases: evolution in list and evolution not in list:
-            # call funct to check if ID+1 is in list
-            evolution = get_poke_dict_by_id(pokemon['ID'] + 1)
-            print(f"Pokemon evolved from {pokemon['Name']} (ID {pokemon['ID']}) to {evolution['Name']} (ID {evolution['ID']}).")
-
-            # case: evolution in list, remove old, print message and return
-            if evolution in owner_node['pokedex']:
-                # Marshtomp was already present; releasing it immediately.
-                print(f"{evolution['Name']} was already present; releasing it immediately.")
-                owner_node['pokedex'].remove(pokemon)
-                return
-            # case: evolution not in list, remove old, add new, return
-            owner_node['pokedex'].remove(pokemon)
-            owner_node['pokedex'].append(evolution)
-            return
+    result, pokemon, evolution = evolve_pokemon(owner_node, name_choice)
+    publish_change(OWNER_FEED, change_feed.CHANGE_EVOLVE, owner_node['owner'], (result, pokemon, evolution))
     # case: not found, print message and return:
-    print(f"No Pokemon named '{name_choice}' in {owner_node['owner']}'s Pokedex.")
+    if result == RESULT_NOT_FOUND:
+        print(f"No Pokemon named '{name_choice}' in {owner_node['owner']}'s Pokedex.")
+        return
+    # case: cannot evolve: print message and return
+    if result == RESULT_CANNOT_EVOLVE:
+        print(f"{pokemon['Name']} cannot evolve.")
+        return
+    print(f"Pokemon evolved from {pokemon['Name']} (ID {pokemon['ID']}) to {evolution['Name']} (ID {evolution['ID']}).")
+    # case: evolution in list, old one was released
+    if result == RESULT_DUPLICATE:
+        print(f"{evolution['Name']} was already present; releasing it immediately.")
 
 
 ########################
@@ -519,21 +833,25 @@ def gather_all_owners(root, arr):
     """
     Collect all BST nodes into a list (arr).
     """
-    # if root is None, return empty list
-    if root == None:
-        return arr
-    # recursively gather all owners into the list
-    # if left side has children, gather them
-    if root['left']:
-        arr += gather_all_owners(root['left'], [])
-    # append current node's info
-    arr.append([root['owner'], len(root['pokedex'])])
-    # if right side has children, gather them
-    if root['right']:
-        arr += gather_all_owners(root['right'], [])
+    # walk the tree in-order (alphabetical), appending each owner's name and pokedex size
+    for node in in_order_nodes(root):
+        arr.append([node['owner'], len(node['pokedex'])])
     # return the accumulated list
     return arr
 
+def owner_sort_key(owner):
+    """
+    Sort key for [owner name, # of pokemon] pairs: by count, then alphabetically (as if lowercase).
+    """
+    return owner[1], owner[0].lower()
+
+def sorted_owners(root):
+    """
+    Return [owner name, # of pokemon] pairs sorted by (#pokedex size, then alpha).
+    """
+    # sort is stable, so owners with the same lowercase name keep their in-order position
+    return sorted(gather_all_owners(root, []), key=owner_sort_key)
+
 def sort_owners_by_num_pokemon():
     """
     Gather owners, sort them by (#pokedex size, then alpha), print results.
@@ -543,21 +861,7 @@ def sort_owners_by_num_pokemon():
     if not ownerRoot:
         print("No owners at all.")
         return
-    # create empty list to store all owners
-    owner_list = []
-    # call gather_all_owners to fill the list
-    owner_list = gather_all_owners(ownerRoot, owner_list)
-    # bubble sort for num pokemon
-    for i in range(len(owner_list)):
-        for j in range(len(owner_list) - 1):
-            if owner_list[j][1] > owner_list[j + 1][1]:
-                owner_list[j], owner_list[j + 1] = owner_list[j + 1], owner_list[j]
-    # bubble sort for alpha: as if lowercase
-    for i in range(len(owner_list)):
-        for j in range(len(owner_list) - 1):
-            if owner_list[j][1] == owner_list[j + 1][1]:
-                if owner_list[j][0].lower() > owner_list[j + 1][0].lower():
-                    owner_list[j], owner_list[j + 1] = owner_list[j + 1], owner_list[j]
+    owner_list = sorted_owners(ownerRoot)
 
     print("=== The Owners we have, sorted by number of Pokemons ===")
     for owner in owner_list:
@@ -569,7 +873,7 @@ def sort_owners_by_num_pokemon():
 
 def print_all_owners():
     """
-    Let user pick BFS, Pre, In, or Post. Print each owner's data/pokedex accordingly.
+    Let user pick BFS, Pre, In, Post, or Browse. Print each owner's data/pokedex accordingly.
     """
     global ownerRoot
     # if no owners, print message and return
@@ -581,6 +885,7 @@ def print_all_owners():
     print("2) Pre-Order")
     print("3) In-Order")
     print("4) Post-Order")
+    print("5) Browse (page by page)")
     choice = read_int_safe("Your choice: ")
     # call relevant function based on choice
     if choice == PRINT_OWNER_BFS:
@@ -595,10 +900,68 @@ def print_all_owners():
     elif choice == PRINT_OWNER_POST:
         post_order(ownerRoot)
         return
+    elif choice == PRINT_OWNER_BROWSE:
+        browse_owners(ownerRoot)
+        return
     else:
         print("Invalid choice.")
         return
 
+def browse_owners(root):
+    """
+    Show owners alphabetically one page at a time, optionally starting from a name.
+    """
+    page_size = read_int_safe("Owners per page: ")
+    if page_size <= 0:
+        print("Invalid page size.")
+        return
+    start_name = input("Start from name (empty for the beginning): ").strip()
+    # first page: owners from start_name on (page numbers count from there)
+    nodes, cursor = scan_owners(root, low=start_name or None, limit=page_size)
+    page_number = 1
+    show_page = True
+    while True:
+        # only re-print the page when it changed
+        if show_page:
+            print(f"\n-- Page {page_number} --")
+            if not nodes:
+                print("No owners on this page.")
+            for node in nodes:
+                print(f"\nOwner: {node['owner']}")
+                display_pokemon_list(node['pokedex'])
+            if cursor is None:
+                print("\n(End of owners)")
+        show_page = True
+        print("\n1. Next page")
+        print("2. Jump to page #")
+        print("3. Back")
+        choice = read_int_safe("Your choice: ")
+        if choice == BROWSE_NEXT:
+            if cursor is None:
+                print("No more owners.")
+                show_page = False
+                continue
+            nodes, cursor = scan_owners(root, low=start_name or None, cursor=cursor, limit=page_size)
+            page_number += 1
+        elif choice == BROWSE_JUMP:
+            # page numbers count from the first owner overall, not from start_name
+            jump_to = read_int_safe("Page number: ")
+            if jump_to <= 0:
+                print("Invalid page number.")
+                show_page = False
+                continue
+            start_name = ""
+            page_number = jump_to
+            nodes = owners_page(root, page_number - 1, page_size)
+            cursor = None
+            if nodes and page_number * page_size < owner_size(root):
+                cursor = encode_owner_cursor(nodes[-1]['owner'])
+        elif choice == BROWSE_BACK:
+            return
+        else:
+            print("Invalid choice.")
+            show_page = False
+
 def pre_order_print(node):
     """
     Helper to print data in pre-order.
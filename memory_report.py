@@ -0,0 +1,186 @@
+import random
+import sys
+import tracemalloc
+
+import ex7
+import owner_store
+
+########################
+# 1) Tree Report
+########################
+
+
+def tree_height(root):
+    """
+    Return the number of levels in the BST (0 for an empty tree), level by level.
+    """
+    height = 0
+    level = [root] if root else []
+    while level:
+        height += 1
+        level = [child for node in level for child in (node['left'], node['right']) if child]
+    return height
+
+
+def memory_report(root):
+    """
+    Summarize the owner BST's shape and memory use. Returns a dict with node count,
+    height, pokedex sizes, and bytes per owner / per pokedex entry (sys.getsizeof of the
+    node dicts, owner names and pokedex lists; the species dicts are shared catalog
+    data and counted once in 'catalog_bytes'). 'lock_bytes' is 0 here; stores with
+    locks add theirs with add_lock_bytes().
+    """
+    node_count = 0
+    entry_count = 0
+    max_pokedex = 0
+    node_bytes = 0
+    name_bytes = 0
+    list_bytes = 0
+    for node in ex7.in_order_nodes(root):
+        node_count += 1
+        pokedex_size = len(node['pokedex'])
+        entry_count += pokedex_size
+        max_pokedex = max(max_pokedex, pokedex_size)
+        node_bytes += sys.getsizeof(node)
+        name_bytes += sys.getsizeof(node['owner'])
+        list_bytes += sys.getsizeof(node['pokedex'])
+    # what the lists cost beyond an empty list is the per-entry price (slots + over-allocation)
+    entry_bytes = list_bytes - node_count * sys.getsizeof([])
+    catalog_bytes = sum(sys.getsizeof(species) for species in ex7.CATALOG['species'].values())
+    total_bytes = node_bytes + name_bytes + list_bytes
+    return {
+        'nodes': node_count,
+        'height': tree_height(root),
+        'entries': entry_count,
+        'avg_pokedex': entry_count / node_count if node_count else 0.0,
+        'max_pokedex': max_pokedex,
+        'node_bytes': node_bytes,
+        'name_bytes': name_bytes,
+        'pokedex_bytes': list_bytes,
+        'lock_bytes': 0,
+        'total_bytes': total_bytes,
+        'bytes_per_owner': total_bytes / node_count if node_count else 0.0,
+        'bytes_per_entry': entry_bytes / entry_count if entry_count else 0.0,
+        'catalog_bytes': catalog_bytes,
+    }
+
+
+def rwlock_bytes(lock):
+    """
+    Return the bytes of an owner_store.RWLock and the objects it owns: its Condition,
+    the Condition's lock, waiter deque and bound acquire / release.
+    """
+    cond = lock._cond
+    parts = (lock, lock.__dict__, cond, cond.__dict__, cond._lock, cond._waiters, cond.acquire, cond.release)
+    return sum(sys.getsizeof(part) for part in parts)
+
+
+def lock_table_bytes(locks):
+    """
+    Return the bytes of a list of RWLocks (e.g. OwnerStore's lock stripes): the list
+    and the locks.
+    """
+    return sys.getsizeof(locks) + sum(rwlock_bytes(lock) for lock in locks)
+
+
+def add_lock_bytes(report, lock_bytes):
+    """
+    Add lock_bytes to a memory_report() dict (and to its total and per-owner figures).
+    """
+    report['lock_bytes'] += lock_bytes
+    report['total_bytes'] += lock_bytes
+    nodes = report['nodes']
+    report['bytes_per_owner'] = report['total_bytes'] / nodes if nodes else 0.0
+    return report
+
+
+def combine_reports(reports):
+    """
+    Merge memory_report() dicts of several trees (e.g. shards) into one.
+    """
+    combined = {key: sum(report[key] for report in reports)
+                for key in ('nodes', 'entries', 'node_bytes', 'name_bytes', 'pokedex_bytes', 'lock_bytes',
+                            'total_bytes')}
+    combined['height'] = max((report['height'] for report in reports), default=0)
+    combined['max_pokedex'] = max((report['max_pokedex'] for report in reports), default=0)
+    nodes = combined['nodes']
+    entries = combined['entries']
+    combined['avg_pokedex'] = entries / nodes if nodes else 0.0
+    combined['bytes_per_owner'] = combined['total_bytes'] / nodes if nodes else 0.0
+    entry_bytes = sum(report['bytes_per_entry'] * report['entries'] for report in reports)
+    combined['bytes_per_entry'] = entry_bytes / entries if entries else 0.0
+    # every process holds its own copy of the catalog
+    combined['catalog_bytes'] = sum(report['catalog_bytes'] for report in reports)
+    return combined
+
+
+########################
+# 2) Allocation Profiling
+########################
+
+
+def profile_workload(workload, top=10, group_by='lineno'):
+    """
+    Run workload() under tracemalloc and return (workload's return value, top allocation
+    sites), where each site is {'site', 'size_bytes', 'count'} for memory still held
+    when the workload finished, largest first. Compare runs to spot leaks.
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = workload()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    # leave out tracemalloc's own bookkeeping
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), group_by)
+    sites = []
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        sites.append({'site': f"{frame.filename}:{frame.lineno}",
+                      'size_bytes': stat.size_diff,
+                      'count': stat.count_diff})
+    return result, sites
+
+
+def print_memory_report(report, sites=None):
+    """
+    Print a memory_report() dict (and optional allocation sites) for people.
+    """
+    print("=== Owner store memory ===")
+    print(f"Owners (nodes): {report['nodes']}  Tree height: {report['height']}")
+    print(f"Pokedex entries: {report['entries']}  Avg per owner: {report['avg_pokedex']:.2f}"
+          f"  Max: {report['max_pokedex']}")
+    print(f"Node dicts: {report['node_bytes']} B  Names: {report['name_bytes']} B"
+          f"  Pokedex lists: {report['pokedex_bytes']} B  Locks: {report['lock_bytes']} B"
+          f"  Total: {report['total_bytes']} B")
+    print(f"Bytes per owner: {report['bytes_per_owner']:.1f}  Bytes per pokedex entry: {report['bytes_per_entry']:.1f}")
+    print(f"Species catalog (shared): {report['catalog_bytes']} B")
+    if sites:
+        print("Top allocation sites:")
+        for site in sites:
+            print(f"  {site['size_bytes'] / 1024:10.1f} KiB  {site['count']:8d} blocks  {site['site']}")
+
+
+def main():
+    """
+    python memory_report.py [num_owners]: load random owners into an OwnerStore under
+    tracemalloc, then print the report and where the memory went.
+    """
+    num_owners = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+    entries = [(f"Owner{i:07d}", ex7.STARTERS[i % 3 + 1],
+                rng.sample(range(1, len(ex7.HOENN_DATA) + 1), rng.randint(0, 20)))
+               for i in range(num_owners)]
+    rng.shuffle(entries)
+    store = owner_store.OwnerStore()
+    _, sites = profile_workload(lambda: store.bulk_load(entries))
+    print_memory_report(store.memory_report(), sites)
+
+
+if __name__ == "__main__":
+    main()
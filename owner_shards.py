@@ -0,0 +1,352 @@
+import heapq
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import threading
+import time
+import zlib
+
+import ex7
+import memory_report
+from owner_store import OwnerStore
+
+########################
+# 1) Shard Worker
+########################
+
+# Owners are partitioned over N worker processes by a hash of the case-folded owner
+# name; each worker holds its own OwnerStore (and so its own BST). Messages on a
+# worker's pipe are (request id, method name, args) and the reply is (request id, ok, value);
+# the id lets the parent skip a reply left over from a call that was interrupted.
+
+
+def shard_index(owner_name, num_shards):
+    """
+    Return the shard owning this name. crc32 rather than hash() so every process
+    agrees regardless of PYTHONHASHSEED.
+    """
+    return zlib.crc32(owner_name.casefold().encode("utf-8")) % num_shards
+
+
+def _shard_worker(conn):
+    """
+    Worker process loop: run store methods until a None message arrives.
+    """
+    store = OwnerStore()
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        request_id, method, args = message
+        try:
+            value = getattr(store, method)(*args)
+            conn.send((request_id, True, value))
+        except Exception as e:
+            conn.send((request_id, False, f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+########################
+# 2) Sharded Owner Store
+########################
+
+# The parent unpickles and merges every row a whole-store query returns, one process
+# doing O(n) work; only the shards' share of the work runs in parallel. So queries
+# returning few rows (selective filters, scans with a limit) can scale with the number
+# of cores, while sorted_owners and traverse, which return every owner, can't beat the
+# parent's serial part (the benchmark prints it).
+
+
+def merge_by_name(parts):
+    """
+    Merge per-shard lists of (owner name, ...) pairs, each alphabetical, into one.
+    """
+    return list(heapq.merge(*parts, key=lambda pair: pair[0].lower()))
+
+
+def merge_by_count(parts):
+    """
+    Merge per-shard sorted_owners() lists into one, by count then name.
+    """
+    return list(heapq.merge(*parts, key=ex7.owner_sort_key))
+
+
+
+class ShardedOwnerStore:
+    """
+    OwnerStore interface spread over worker processes.
+    Point operations go to the owner's shard; whole-store queries (sorted by count,
+    filters over every owner, in-order traversal) are sent to all shards at once and
+    the per-shard results are k-way merged.
+    Use close() (or a with block) to stop the workers.
+    """
+
+    def __init__(self, num_shards=None):
+        self.num_shards = num_shards or os.cpu_count() or 1
+        self._conns = []
+        self._procs = []
+        # one request at a time per pipe; scatter takes every lock in shard order
+        self._locks = []
+        # id of the last request sent on each pipe (guarded by that pipe's lock)
+        self._request_ids = []
+        for _ in range(self.num_shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_shard_worker, args=(child_conn,), daemon=True)
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+            self._locks.append(threading.Lock())
+            self._request_ids.append(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        for conn, proc in zip(self._conns, self._procs):
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            proc.join()
+            conn.close()
+        self._conns = []
+        self._procs = []
+
+    @staticmethod
+    def _unwrap(reply):
+        ok, value = reply
+        if not ok:
+            raise RuntimeError(f"shard worker failed: {value}")
+        return value
+
+    def _send(self, shard, method, args):
+        # caller holds the shard's lock
+        self._request_ids[shard] += 1
+        self._conns[shard].send((self._request_ids[shard], method, args))
+        return self._request_ids[shard]
+
+    def _receive(self, shard, request_id):
+        """
+        Return (ok, value) of the reply to request_id, skipping replies to earlier
+        requests whose caller was interrupted before reading them. Caller holds the lock.
+        """
+        while True:
+            reply_id, ok, value = self._conns[shard].recv()
+            if reply_id == request_id:
+                return ok, value
+
+    def _call(self, shard, method, *args):
+        with self._locks[shard]:
+            request_id = self._send(shard, method, args)
+            return self._unwrap(self._receive(shard, request_id))
+
+    def _route(self, owner_name, method, *args):
+        return self._call(shard_index(owner_name, self.num_shards), method, owner_name, *args)
+
+    def _scatter(self, method, *args):
+        """
+        Send the same call to every shard, then collect the replies, so the shards work in parallel.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            request_ids = [self._send(shard, method, args) for shard in range(self.num_shards)]
+            # read every reply before raising, so no pipe is left holding an answer
+            replies = [self._receive(shard, request_id) for shard, request_id in enumerate(request_ids)]
+            return [self._unwrap(reply) for reply in replies]
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    # --- point operations ---
+
+    def create_owner(self, owner_name, starter_name):
+        return self._route(owner_name, "create_owner", starter_name)
+
+    def delete_owner(self, owner_name):
+        return self._route(owner_name, "delete_owner")
+
+    def add_pokemon(self, owner_name, poke_id):
+        return self._route(owner_name, "add_pokemon", poke_id)
+
+    def release_pokemon(self, owner_name, poke_name):
+        return self._route(owner_name, "release_pokemon", poke_name)
+
+    def evolve_pokemon(self, owner_name, poke_name):
+        return self._route(owner_name, "evolve_pokemon", poke_name)
+
+    def get_pokedex(self, owner_name):
+        return self._route(owner_name, "get_pokedex")
+
+    def filter_pokedex(self, owner_name, choice, value=None):
+        return self._route(owner_name, "filter_pokedex", choice, value)
+
+    def bulk_load(self, entries):
+        """
+        Create owners from (owner name, starter name, [pokemon IDs]) entries, one message per shard.
+        Return how many owners were created.
+        """
+        per_shard = [[] for _ in range(self.num_shards)]
+        for entry in entries:
+            per_shard[shard_index(entry[0], self.num_shards)].append(entry)
+        created = 0
+        for shard, shard_entries in enumerate(per_shard):
+            created += self._call(shard, "bulk_load", shard_entries)
+        return created
+
+    # --- scatter-gather queries ---
+
+    def owner_count(self):
+        return sum(self._scatter("owner_count"))
+
+    def sorted_owners(self):
+        """
+        Return [owner name, # of pokemon] pairs sorted by count, then alphabetically.
+        """
+        return merge_by_count(self._scatter("sorted_owners"))
+
+    def filter_all_owners(self, choice, value=None):
+        """
+        Apply a display filter to every pokedex on every shard. Return (owner name, matches)
+        pairs in alphabetical order, skipping owners with no matches.
+        """
+        return merge_by_name(self._scatter("filter_all_owners", choice, value))
+
+    def traverse(self, order=ex7.PRINT_OWNER_IN):
+        """
+        Return (owner name, pokedex copy) pairs. In-order is merged into one alphabetical
+        list; there is no global tree shape, so other orders return each shard's
+        traversal one shard after another.
+        """
+        parts = self._scatter("traverse", order)
+        if order == ex7.PRINT_OWNER_IN:
+            return merge_by_name(parts)
+        return [pair for part in parts for pair in part]
+
+    def memory_report(self):
+        """
+        Return the shards' memory reports combined into one.
+        """
+        return memory_report.combine_reports(self._scatter("memory_report"))
+
+    def scan_owners(self, low=None, high=None, cursor=None, limit=None):
+        """
+        Return ((owner name, pokedex copy) pairs, next cursor). Every shard returns its
+        first limit owners in the range; the global first limit are among those.
+        """
+        ex7.check_scan_limit(limit)
+        parts = self._scatter("scan_owners", low, high, cursor, limit)
+        merged = list(heapq.merge(*[pairs for pairs, _ in parts], key=lambda pair: pair[0].lower()))
+        more = any(next_cursor for _, next_cursor in parts)
+        if limit is not None and len(merged) > limit:
+            merged = merged[:limit]
+            more = True
+        if not more or not merged:
+            return merged, None
+        return merged, ex7.encode_owner_cursor(merged[-1][0])
+
+    def owners_page(self, page_number, page_size):
+        """
+        Return (owner name, pokedex copy) pairs on page page_number (0 based). Shards don't
+        know global positions, so this reads every page before it; prefer scan_owners.
+        """
+        ex7.check_page_args(page_number, page_size)
+        pairs, _ = self.scan_owners(limit=(page_number + 1) * page_size)
+        return pairs[page_number * page_size:]
+
+
+########################
+# 3) Benchmark
+########################
+
+
+def _random_entries(num_owners, seed=0):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(num_owners):
+        poke_ids = rng.sample(range(1, len(ex7.HOENN_DATA) + 1), rng.randint(0, 20))
+        entries.append((f"Owner{i:07d}", ex7.STARTERS[i % 3 + 1], poke_ids))
+    # shuffled so each shard's BST stays shallow
+    rng.shuffle(entries)
+    return entries
+
+
+def _time_queries(store, repeats):
+    """
+    Return the best time of each aggregate query over a few repeats.
+    """
+    queries = {
+        "sorted_owners": lambda: store.sorted_owners(),
+        "filter_all_owners": lambda: store.filter_all_owners(ex7.DISP_ATTACK_ABOVE, 140),
+        "traverse(in)": lambda: store.traverse(ex7.PRINT_OWNER_IN),
+    }
+    timings = {}
+    for name, query in queries.items():
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            query()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    return timings
+
+
+def _parent_times(store, repeats):
+    """
+    Return the parent's serial time for each aggregate query (best of a few repeats):
+    unpickling the shards' replies and merging them. No number of cores makes a query
+    faster than this.
+    """
+    queries = {
+        "sorted_owners": (("sorted_owners",), merge_by_count),
+        "filter_all_owners": (("filter_all_owners", ex7.DISP_ATTACK_ABOVE, 140), merge_by_name),
+        "traverse(in)": (("traverse", ex7.PRINT_OWNER_IN), merge_by_name),
+    }
+    timings = {}
+    for name, (call, merge) in queries.items():
+        replies = [pickle.dumps(part) for part in store._scatter(*call)]
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            merge([pickle.loads(reply) for reply in replies])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    return timings
+
+
+def benchmark(shard_counts=(1, 2, 4, 8), num_owners=100000, repeats=3):
+    """
+    Time the aggregate queries on one in-process OwnerStore and on N shards.
+    Print each time, its speedup over one in-process store, and the best speedup the
+    parent's serial share allows.
+    """
+    entries = _random_entries(num_owners)
+    print(f"owners: {num_owners}  cpus: {os.cpu_count()}")
+
+    single = OwnerStore()
+    single.bulk_load(entries)
+    baseline = _time_queries(single, repeats)
+    for name, elapsed in baseline.items():
+        print(f"in-process  {name:18s} {elapsed * 1000:9.1f} ms")
+
+    for num_shards in shard_counts:
+        with ShardedOwnerStore(num_shards) as store:
+            store.bulk_load(entries)
+            timings = _time_queries(store, repeats)
+            parent = _parent_times(store, repeats)
+        for name, elapsed in timings.items():
+            print(f"shards: {num_shards:2d}  {name:18s} {elapsed * 1000:9.1f} ms  speedup: {baseline[name] / elapsed:5.2f}x"
+                  f"  parent: {parent[name] * 1000:7.1f} ms  max speedup: {baseline[name] / parent[name]:6.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark(num_owners=int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
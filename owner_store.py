@@ -0,0 +1,383 @@
+import random
+import threading
+import time
+
+import change_feed
+import ex7
+import memory_report
+
+########################
+# 1) Reader-Writer Lock
+########################
+
+
+class RWLock:
+    """
+    Reader-writer lock: many readers at once, or one writer alone.
+    Writers get preference, so a steady stream of readers can't starve them.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            # wait while a writer holds or is waiting for the lock
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    def read_locked(self):
+        """
+        Context manager holding the lock for reading.
+        """
+        return _LockGuard(self.acquire_read, self.release_read)
+
+    def write_locked(self):
+        """
+        Context manager holding the lock for writing.
+        """
+        return _LockGuard(self.acquire_write, self.release_write)
+
+
+class _LockGuard:
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+        return False
+
+
+########################
+# 2) Owner Store
+########################
+
+# Pokedex locks are a fixed pool shared by hash of the lowercase owner name, so memory
+# doesn't grow with the number of owners; edits to owners on different stripes still
+# run in parallel.
+OWNER_LOCK_STRIPES = 64
+
+
+class OwnerStore:
+    """
+    Thread-safe wrapper around the owner BST and the pokedex operations of ex7.
+
+    Locking:
+    - The tree lock guards the BST shape. Creating / deleting an owner takes it for
+      writing, everything else takes it for reading.
+    - Each owner's pokedex is guarded by one of OWNER_LOCK_STRIPES locks (picked by a
+      hash of the lowercase name). Add / release / evolve take it for writing, filters
+      and lookups take it for reading, so edits to different owners mostly don't serialize.
+    Lock order is always tree lock -> owner lock, and only one owner lock is held at a time.
+
+    Results use the RESULT_* constants of ex7. Returned pokedexes are copies.
+    With a ChangeFeed, every change is published to it (inside the locks, so each owner's
+    events are in the order they were applied).
+    """
+
+    def __init__(self, root=None, feed=None):
+        self._root = root
+        self.feed = feed
+        self._tree_lock = RWLock()
+        self._owner_locks = [RWLock() for _ in range(OWNER_LOCK_STRIPES)]
+
+    def _owner_lock(self, owner_name):
+        return self._owner_locks[hash(owner_name.lower()) % OWNER_LOCK_STRIPES]
+
+    # --- tree (exclusive writers) ---
+
+    def create_owner(self, owner_name, starter_name):
+        """
+        Create a new owner with a starter Pokemon. Return RESULT_OK, RESULT_DUPLICATE
+        if the owner exists, or RESULT_NOT_FOUND if the starter is unknown.
+        """
+        starter = ex7.get_poke_dict_by_name(starter_name)
+        if not starter:
+            return ex7.RESULT_NOT_FOUND
+        with self._tree_lock.write_locked():
+            if ex7.find_owner_bst(self._root, owner_name):
+                return ex7.RESULT_DUPLICATE
+            node = ex7.create_owner_node(owner_name, starter)
+            self._root = ex7.insert_owner_bst(self._root, node)
+            ex7.publish_change(self.feed, change_feed.CHANGE_CREATE, owner_name, (ex7.RESULT_OK, starter))
+        return ex7.RESULT_OK
+
+    def delete_owner(self, owner_name):
+        """
+        Delete an owner and its pokedex. Return RESULT_OK or RESULT_NO_OWNER.
+        """
+        with self._tree_lock.write_locked():
+            node = ex7.find_owner_bst(self._root, owner_name)
+            if not node:
+                return ex7.RESULT_NO_OWNER
+            stored_name = node['owner']
+            self._root = ex7.delete_owner_bst(self._root, owner_name)
+            ex7.publish_change(self.feed, change_feed.CHANGE_DELETE, stored_name)
+        return ex7.RESULT_OK
+
+    # --- pokedex edits (exclusive per owner) ---
+
+    def _edit_owner(self, owner_name, kind, operation, *args):
+        """
+        Run operation(owner_node, *args) holding the tree read lock and the owner's write lock,
+        and publish the change (of this change_feed kind). Return None if the owner doesn't exist.
+        """
+        with self._tree_lock.read_locked():
+            node = ex7.find_owner_bst(self._root, owner_name)
+            if not node:
+                return None
+            with self._owner_lock(node['owner']).write_locked():
+                outcome = operation(node, *args)
+                ex7.publish_change(self.feed, kind, node['owner'], outcome)
+                return outcome
+
+    def add_pokemon(self, owner_name, poke_id):
+        """
+        Add a Pokemon by ID. Return (result, pokemon dict or None).
+        """
+        outcome = self._edit_owner(owner_name, change_feed.CHANGE_ADD, ex7.add_pokemon_by_id, poke_id)
+        return outcome if outcome else (ex7.RESULT_NO_OWNER, None)
+
+    def release_pokemon(self, owner_name, poke_name):
+        """
+        Release a Pokemon by name. Return (result, pokemon dict or None).
+        """
+        outcome = self._edit_owner(owner_name, change_feed.CHANGE_RELEASE, ex7.release_pokemon, poke_name)
+        return outcome if outcome else (ex7.RESULT_NO_OWNER, None)
+
+    def evolve_pokemon(self, owner_name, poke_name):
+        """
+        Evolve a Pokemon by name. Return (result, old pokemon dict, evolution dict).
+        """
+        outcome = self._edit_owner(owner_name, change_feed.CHANGE_EVOLVE, ex7.evolve_pokemon, poke_name)
+        return outcome if outcome else (ex7.RESULT_NO_OWNER, None, None)
+
+    def bulk_load(self, entries):
+        """
+        Create owners from (owner name, starter name, [pokemon IDs]) entries.
+        Return how many owners were created.
+        """
+        return bulk_load(self, entries)
+
+    # --- readers (shared) ---
+
+    def _read_owner(self, owner_name, operation, *args):
+        with self._tree_lock.read_locked():
+            node = ex7.find_owner_bst(self._root, owner_name)
+            if not node:
+                return None
+            with self._owner_lock(node['owner']).read_locked():
+                return operation(node, *args)
+
+    def get_pokedex(self, owner_name):
+        """
+        Return a copy of the owner's pokedex, or None if the owner doesn't exist.
+        """
+        return self._read_owner(owner_name, lambda node: list(node['pokedex']))
+
+    def filter_pokedex(self, owner_name, choice, value=None):
+        """
+        Apply a display filter (DISP_* option) to the owner's pokedex.
+        Return the matching list, or None if the owner doesn't exist.
+        """
+        return self._read_owner(owner_name, lambda node: ex7.filter_pokedex(node['pokedex'], choice, value))
+
+    def owner_count(self):
+        with self._tree_lock.read_locked():
+            return ex7.owner_size(self._root)
+
+    def sorted_owners(self):
+        """
+        Return [owner name, # of pokemon] pairs sorted by count, then alphabetically.
+        """
+        with self._tree_lock.read_locked():
+            return ex7.sorted_owners(self._root)
+
+    def filter_all_owners(self, choice, value=None):
+        """
+        Apply a display filter (DISP_* option) to every pokedex. Return (owner name, matches)
+        pairs in alphabetical order, skipping owners with no matches.
+        """
+        with self._tree_lock.read_locked():
+            result = []
+            for node in ex7.in_order_nodes(self._root):
+                with self._owner_lock(node['owner']).read_locked():
+                    matches = ex7.filter_pokedex(node['pokedex'], choice, value)
+                if matches:
+                    result.append((node['owner'], matches))
+            return result
+
+    def traverse(self, order=ex7.PRINT_OWNER_IN):
+        """
+        Return (owner name, pokedex copy) pairs in the given PRINT_OWNER_* order,
+        all taken under one tree read lock so the result is a consistent view.
+        """
+        with self._tree_lock.read_locked():
+            return self._copy_owners(ex7.TRAVERSALS[order](self._root))
+
+    def export_state(self):
+        """
+        Return (feed sequence number, in-order (owner name, pokedex copy) pairs) taken
+        together, for change_feed.export_full. Blocks writers while it copies.
+        """
+        # pokedex edits hold the tree read lock, so the write lock stops every writer
+        with self._tree_lock.write_locked():
+            seq = self.feed.last_seq() if self.feed else 0
+            return seq, self._copy_owners(ex7.in_order_nodes(self._root))
+
+    def memory_report(self):
+        """
+        Return memory_report.memory_report() for the tree, plus the owner lock stripes.
+        """
+        with self._tree_lock.read_locked():
+            report = memory_report.memory_report(self._root)
+            return memory_report.add_lock_bytes(report, memory_report.lock_table_bytes(self._owner_locks))
+
+    def scan_owners(self, low=None, high=None, cursor=None, limit=None):
+        """
+        Return ((owner name, pokedex copy) pairs, next cursor) for up to limit owners
+        alphabetically between low and high, continuing after cursor (see ex7.scan_owners).
+        """
+        with self._tree_lock.read_locked():
+            nodes, next_cursor = ex7.scan_owners(self._root, low, high, cursor, limit)
+            return self._copy_owners(nodes), next_cursor
+
+    def owners_page(self, page_number, page_size):
+        """
+        Return (owner name, pokedex copy) pairs on page page_number (0 based), alphabetically.
+        """
+        with self._tree_lock.read_locked():
+            return self._copy_owners(ex7.owners_page(self._root, page_number, page_size))
+
+    def _copy_owners(self, nodes):
+        # caller holds the tree read lock
+        result = []
+        for node in nodes:
+            with self._owner_lock(node['owner']).read_locked():
+                result.append((node['owner'], list(node['pokedex'])))
+        return result
+
+
+def bulk_load(store, entries):
+    """
+    Create owners from (owner name, starter name, [pokemon IDs]) entries through the
+    store's own create_owner / add_pokemon. Return how many owners were created.
+    """
+    created = 0
+    for owner_name, starter_name, poke_ids in entries:
+        if store.create_owner(owner_name, starter_name) != ex7.RESULT_OK:
+            continue
+        created += 1
+        for poke_id in poke_ids:
+            store.add_pokemon(owner_name, poke_id)
+    return created
+
+
+########################
+# 3) Stress Test
+########################
+
+
+def _stress_worker(store, owner_names, num_ops, read_ratio, seed, counts, index):
+    """
+    Run a random mix of reads and writes against the store, record how many ran.
+    """
+    rng = random.Random(seed)
+    done = 0
+    for _ in range(num_ops):
+        owner = rng.choice(owner_names)
+        roll = rng.random()
+        if roll < read_ratio:
+            # readers: lookups, filters, and now and then a sort or traversal
+            pick = rng.random()
+            if pick < 0.01:
+                store.sorted_owners()
+            elif pick < 0.02:
+                store.traverse(ex7.PRINT_OWNER_IN)
+            elif pick < 0.5:
+                store.get_pokedex(owner)
+            else:
+                store.filter_pokedex(owner, ex7.DISP_EVOLVABLE)
+        else:
+            # writers: mostly pokedex edits, some owner churn
+            pick = rng.random()
+            if pick < 0.45:
+                store.add_pokemon(owner, rng.randint(1, len(ex7.HOENN_DATA)))
+            elif pick < 0.75:
+                store.release_pokemon(owner, rng.choice(ex7.HOENN_DATA)['Name'])
+            elif pick < 0.95:
+                store.evolve_pokemon(owner, rng.choice(ex7.HOENN_DATA)['Name'])
+            else:
+                temp_name = f"temp-{index}-{done}"
+                store.create_owner(temp_name, ex7.STARTERS[1])
+                store.delete_owner(temp_name)
+        done += 1
+    counts[index] = done
+
+
+def stress_test(thread_counts=(1, 2, 4, 8), num_owners=500, ops_per_thread=5000, read_ratio=0.8,
+                store_factory=OwnerStore):
+    """
+    Hammer one store (an OwnerStore by default) from a growing number of threads and
+    print throughput. Return a list of (threads, ops/sec).
+    """
+    results = []
+    for num_threads in thread_counts:
+        # fresh store for every run, owners created in shuffled order to keep the BST shallow
+        store = store_factory()
+        owner_names = [f"Owner{i:05d}" for i in range(num_owners)]
+        shuffled = list(owner_names)
+        random.Random(0).shuffle(shuffled)
+        for i, name in enumerate(shuffled):
+            store.create_owner(name, ex7.STARTERS[i % 3 + 1])
+
+        counts = [0] * num_threads
+        threads = [threading.Thread(target=_stress_worker,
+                                    args=(store, owner_names, ops_per_thread, read_ratio, i, counts, i))
+                   for i in range(num_threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        # sanity check: the temp owners must all be gone again
+        if store.owner_count() != num_owners:
+            raise RuntimeError(f"owner count {store.owner_count()} != {num_owners} after stress run")
+        ops_per_sec = sum(counts) / elapsed
+        results.append((num_threads, ops_per_sec))
+        print(f"threads: {num_threads:3d}  ops: {sum(counts):8d}  time: {elapsed:7.3f}s  ops/sec: {ops_per_sec:10.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    stress_test()
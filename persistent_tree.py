@@ -0,0 +1,244 @@
+import threading
+
+import change_feed
+import ex7
+import memory_report
+import owner_store
+
+########################
+# 1) Path-Copying BST
+########################
+
+# Same node dicts as ex7 ('owner', 'pokedex', 'left', 'right'), but nodes and their
+# pokedex lists are never changed once they are part of a tree. Every mutation copies
+# the nodes on the path from the root to the change and returns a new root; untouched
+# subtrees are shared. An old root therefore stays a valid, unchanging snapshot, and
+# the ex7 traversals (bfs_nodes, in_order_nodes, ...) work on it as usual.
+
+
+def _copy_node(node, **changes):
+    new_node = dict(node)
+    new_node.update(changes)
+    ex7.update_size(new_node)
+    return new_node
+
+
+def insert_owner_persistent(root, new_node):
+    """
+    Insert a new node by owner name (alphabetically, as if lowercase). Return the new root.
+    """
+    if root == None:
+        return new_node
+    if new_node['owner'].lower() < root['owner'].lower():
+        return _copy_node(root, left=insert_owner_persistent(root['left'], new_node))
+    if new_node['owner'].lower() > root['owner'].lower():
+        return _copy_node(root, right=insert_owner_persistent(root['right'], new_node))
+    # already in the tree, nothing changes
+    return root
+
+
+def delete_owner_persistent(root, owner_name):
+    """
+    Remove the node for owner_name. Return the new root (the old one is left as is).
+    """
+    if root == None:
+        return None
+    if owner_name.lower() == root['owner'].lower():
+        # no children / one child: the child subtree is shared as is
+        if root['left'] == None:
+            return root['right']
+        if root['right'] == None:
+            return root['left']
+        # two children: a new node takes the min right's data, instead of overwriting root
+        min_right = ex7.min_node(root['right'])
+        new_node = {'owner': min_right['owner'],
+                    'pokedex': min_right['pokedex'],
+                    'left': root['left'],
+                    'right': delete_owner_persistent(root['right'], min_right['owner'])}
+        ex7.update_size(new_node)
+        return new_node
+    if owner_name.lower() < root['owner'].lower():
+        return _copy_node(root, left=delete_owner_persistent(root['left'], owner_name))
+    return _copy_node(root, right=delete_owner_persistent(root['right'], owner_name))
+
+
+def update_owner_persistent(root, owner_name, operation, *args):
+    """
+    Run operation(node, *args) (e.g. ex7.add_pokemon_by_id) on a copy of the owner's node
+    with a copy of its pokedex. Return (new root, operation's return value), or
+    (root, None) if the owner doesn't exist. If the pokedex didn't change, root is
+    returned unchanged.
+    """
+    if root == None:
+        return None, None
+    if owner_name.lower() == root['owner'].lower():
+        new_node = _copy_node(root, pokedex=list(root['pokedex']))
+        outcome = operation(new_node, *args)
+        if new_node['pokedex'] == root['pokedex']:
+            return root, outcome
+        return new_node, outcome
+    if owner_name.lower() < root['owner'].lower():
+        new_left, outcome = update_owner_persistent(root['left'], owner_name, operation, *args)
+        if new_left is root['left']:
+            return root, outcome
+        return _copy_node(root, left=new_left), outcome
+    new_right, outcome = update_owner_persistent(root['right'], owner_name, operation, *args)
+    if new_right is root['right']:
+        return root, outcome
+    return _copy_node(root, right=new_right), outcome
+
+
+########################
+# 2) Persistent Owner Store
+########################
+
+
+class PersistentOwnerStore:
+    """
+    OwnerStore interface on a path-copying tree.
+    Writers are serialized by one lock and publish a new root when done; readers never
+    lock, they just read the current root. snapshot() captures that root in O(1); pass
+    it to the readers to traverse it at any pace, or to restore() to roll back.
+    With a ChangeFeed, every change is published to it under the write lock.
+    """
+
+    def __init__(self, root=None, feed=None):
+        self._root = root
+        self.feed = feed
+        self._write_lock = threading.Lock()
+
+    # --- snapshots ---
+
+    def snapshot(self):
+        """
+        Return a point-in-time copy of the store in O(1): {'root': root}.
+        The root is never changed afterwards.
+        """
+        return {'root': self._root}
+
+    def export_state(self):
+        """
+        Return (feed sequence number, in-order (owner name, pokedex copy) pairs) of one
+        snapshot, for change_feed.export_full. Only the O(1) snapshot blocks writers.
+        """
+        with self._write_lock:
+            seq = self.feed.last_seq() if self.feed else 0
+            snapshot = self.snapshot()
+        return seq, self.traverse(ex7.PRINT_OWNER_IN, snapshot)
+
+    def restore(self, snapshot):
+        """
+        Make a snapshot the current state again. The change feed gets a reset event, and
+        events before it are dropped, so consumers take a full export instead of a delta.
+        """
+        with self._write_lock:
+            self._root = snapshot['root']
+            if self.feed is not None:
+                self.feed.reset()
+
+    def _root_of(self, snapshot):
+        return self._root if snapshot is None else snapshot['root']
+
+    # --- writers ---
+
+    def create_owner(self, owner_name, starter_name):
+        starter = ex7.get_poke_dict_by_name(starter_name)
+        if not starter:
+            return ex7.RESULT_NOT_FOUND
+        with self._write_lock:
+            if ex7.find_owner_bst(self._root, owner_name):
+                return ex7.RESULT_DUPLICATE
+            node = ex7.create_owner_node(owner_name, starter)
+            self._root = insert_owner_persistent(self._root, node)
+            ex7.publish_change(self.feed, change_feed.CHANGE_CREATE, owner_name, (ex7.RESULT_OK, starter))
+        return ex7.RESULT_OK
+
+    def delete_owner(self, owner_name):
+        with self._write_lock:
+            node = ex7.find_owner_bst(self._root, owner_name)
+            if not node:
+                return ex7.RESULT_NO_OWNER
+            self._root = delete_owner_persistent(self._root, owner_name)
+            ex7.publish_change(self.feed, change_feed.CHANGE_DELETE, node['owner'])
+        return ex7.RESULT_OK
+
+    def _edit_owner(self, owner_name, kind, operation, *args):
+        with self._write_lock:
+            node = ex7.find_owner_bst(self._root, owner_name)
+            if not node:
+                return None
+            self._root, outcome = update_owner_persistent(self._root, owner_name, operation, *args)
+            ex7.publish_change(self.feed, kind, node['owner'], outcome)
+        return outcome
+
+    def add_pokemon(self, owner_name, poke_id):
+        outcome = self._edit_owner(owner_name, change_feed.CHANGE_ADD, ex7.add_pokemon_by_id, poke_id)
+        return outcome if outcome else (ex7.RESULT_NO_OWNER, None)
+
+    def release_pokemon(self, owner_name, poke_name):
+        outcome = self._edit_owner(owner_name, change_feed.CHANGE_RELEASE, ex7.release_pokemon, poke_name)
+        return outcome if outcome else (ex7.RESULT_NO_OWNER, None)
+
+    def evolve_pokemon(self, owner_name, poke_name):
+        outcome = self._edit_owner(owner_name, change_feed.CHANGE_EVOLVE, ex7.evolve_pokemon, poke_name)
+        return outcome if outcome else (ex7.RESULT_NO_OWNER, None, None)
+
+    def bulk_load(self, entries):
+        return owner_store.bulk_load(self, entries)
+
+    # --- readers (lock free, each call sees one snapshot) ---
+
+    def get_pokedex(self, owner_name, snapshot=None):
+        root = self._root_of(snapshot)
+        node = ex7.find_owner_bst(root, owner_name)
+        return list(node['pokedex']) if node else None
+
+    def filter_pokedex(self, owner_name, choice, value=None, snapshot=None):
+        root = self._root_of(snapshot)
+        node = ex7.find_owner_bst(root, owner_name)
+        return ex7.filter_pokedex(node['pokedex'], choice, value) if node else None
+
+    def owner_count(self, snapshot=None):
+        return ex7.owner_size(self._root_of(snapshot))
+
+    def sorted_owners(self, snapshot=None):
+        return ex7.sorted_owners(self._root_of(snapshot))
+
+    def filter_all_owners(self, choice, value=None, snapshot=None):
+        result = []
+        for node in ex7.in_order_nodes(self._root_of(snapshot)):
+            matches = ex7.filter_pokedex(node['pokedex'], choice, value)
+            if matches:
+                result.append((node['owner'], matches))
+        return result
+
+    def iter_traverse(self, order=ex7.PRINT_OWNER_IN, snapshot=None):
+        """
+        Yield (owner name, pokedex) pairs lazily from one snapshot (the current root by
+        default); writes made while iterating are not seen. The pokedex lists are shared
+        with the tree, don't change them.
+        """
+        root = self._root_of(snapshot)
+        for node in ex7.TRAVERSALS[order](root):
+            yield node['owner'], node['pokedex']
+
+    def traverse(self, order=ex7.PRINT_OWNER_IN, snapshot=None):
+        return [(owner, list(pokedex)) for owner, pokedex in self.iter_traverse(order, snapshot)]
+
+    def memory_report(self, snapshot=None):
+        """
+        Return memory_report.memory_report() for one snapshot (nodes shared with other
+        snapshots are counted as if they weren't).
+        """
+        return memory_report.memory_report(self._root_of(snapshot))
+
+    def scan_owners(self, low=None, high=None, cursor=None, limit=None, snapshot=None):
+        """
+        Return ((owner name, pokedex copy) pairs, next cursor), see ex7.scan_owners.
+        """
+        nodes, next_cursor = ex7.scan_owners(self._root_of(snapshot), low, high, cursor, limit)
+        return [(node['owner'], list(node['pokedex'])) for node in nodes], next_cursor
+
+    def owners_page(self, page_number, page_size, snapshot=None):
+        nodes = ex7.owners_page(self._root_of(snapshot), page_number, page_size)
+        return [(node['owner'], list(node['pokedex'])) for node in nodes]
@@ -4,11 +4,13 @@ import tkinter as tk
 from PIL import Image, ImageTk
 import os
 
+import catalog
+
 
 def show_Pokedex_GUI(pokeList):
     """
     Display each Pokemon in a simple Tkinter window with its Name, Type, HP,
-    Attack, and optionally an image from the 'pokemons' folder.
+    Attack, and optionally an image from the 'pokemons' folder (by global ID).
     We allow horizontal resizing so each Pokemon 'frame' expands in width.
     """
     root = tk.Tk()
@@ -77,7 +79,7 @@ def show_Pokedex_GUI(pokeList):
             label = tk.Label(frame, text=info, anchor="w")
             label.pack(side="left", fill="x", expand=True)
 
-            image_path = os.path.join("pokemons", f"{poke['ID'] + 251}.png")
+            image_path = catalog.sprite_path(poke['Global ID'])
             if os.path.exists(image_path):
                 try:
                     img = Image.open(image_path)
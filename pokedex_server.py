@@ -0,0 +1,453 @@
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+
+import change_feed
+import ex7
+from owner_store import OwnerStore
+from sqlite_store import SqliteOwnerStore
+
+########################
+# 0) Protocol
+########################
+
+# One JSON object per line in both directions.
+# Request:  {"id": <any>, "op": <op name>, ...op arguments}
+# Response: {"id": <same id>, "ok": true/false, "result": <result name>, ...payload}
+# Responses come back in request order, so clients may pipeline requests.
+# "traverse" streams one {"id", "owner", "pokedex"} line per owner, then a final
+# {"id", "ok": true, "done": true, "count": n} line.
+# A request line longer than MAX_LINE gets {"id": null, "ok": false, "error": "line too long"}
+# and the connection is closed.
+# "changes" returns the change feed events after "since" (see change_feed), and "last_seq"
+# to pass as "since" next time; ok is false with "trimmed": true if they're gone.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7007
+
+# max requests read ahead of the one being answered (per connection)
+MAX_PIPELINE = 128
+# start waiting for the client to read once this many bytes are buffered
+WRITE_HIGH_WATER = 64 * 1024
+# max bytes in one request line
+MAX_LINE = 64 * 1024
+# traversal lines read from the store per executor call, and written between drains
+TRAVERSE_CHUNK = 64
+
+# queued in place of a request line that was too long
+_LINE_TOO_LONG = object()
+
+# errors from a handler (or a traversal) that mean the request's arguments were bad
+BAD_ARGUMENT_ERRORS = (KeyError, TypeError, ValueError, AttributeError)
+
+RESULT_NAMES = {
+    ex7.RESULT_OK: "ok",
+    ex7.RESULT_NOT_FOUND: "not_found",
+    ex7.RESULT_DUPLICATE: "duplicate",
+    ex7.RESULT_CANNOT_EVOLVE: "cannot_evolve",
+    ex7.RESULT_NO_OWNER: "no_owner",
+}
+
+FILTER_NAMES = {
+    "type": ex7.DISP_CERTAIN_TYPE,
+    "evolvable": ex7.DISP_EVOLVABLE,
+    "attack": ex7.DISP_ATTACK_ABOVE,
+    "hp": ex7.DISP_HP_ABOVE,
+    "name": ex7.DISP_NAME_STARTS,
+    "all": ex7.DISP_ALL,
+}
+
+ORDER_NAMES = {
+    "bfs": ex7.PRINT_OWNER_BFS,
+    "pre": ex7.PRINT_OWNER_PRE,
+    "in": ex7.PRINT_OWNER_IN,
+    "post": ex7.PRINT_OWNER_POST,
+}
+
+
+def _whole_number(request, key, default=None):
+    """
+    Return request[key] (default if missing), which must be a JSON whole number.
+    """
+    value = request.get(key, default)
+    if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+        raise ValueError(f"{key} must be a whole number")
+    return value
+
+def _result_response(result, **payload):
+    response = {"ok": result == ex7.RESULT_OK, "result": RESULT_NAMES[result]}
+    response.update(payload)
+    return response
+
+
+########################
+# 1) Operations
+########################
+
+def op_create(store, request):
+    starter = request["starter"]
+    # allow the menu number as well as the name
+    if isinstance(starter, int):
+        starter = ex7.STARTERS.get(starter, "")
+    return _result_response(store.create_owner(request["owner"], starter))
+
+def op_find(store, request):
+    pokedex = store.get_pokedex(request["owner"])
+    if pokedex is None:
+        return _result_response(ex7.RESULT_NO_OWNER)
+    return _result_response(ex7.RESULT_OK, pokedex=pokedex)
+
+def op_delete(store, request):
+    return _result_response(store.delete_owner(request["owner"]))
+
+def op_add(store, request):
+    poke_id = _whole_number(request, "poke_id")
+    if poke_id is None:
+        raise KeyError("poke_id")
+    result, pokemon = store.add_pokemon(request["owner"], poke_id)
+    return _result_response(result, pokemon=pokemon)
+
+def op_release(store, request):
+    result, pokemon = store.release_pokemon(request["owner"], request["name"])
+    return _result_response(result, pokemon=pokemon)
+
+def op_evolve(store, request):
+    result, pokemon, evolution = store.evolve_pokemon(request["owner"], request["name"])
+    return _result_response(result, pokemon=pokemon, evolution=evolution)
+
+def op_filter(store, request):
+    choice = FILTER_NAMES[request["filter"]]
+    matches = store.filter_pokedex(request["owner"], choice, request.get("value"))
+    if matches is None:
+        return _result_response(ex7.RESULT_NO_OWNER)
+    return _result_response(ex7.RESULT_OK, pokedex=matches)
+
+def op_sorted(store, request):
+    return _result_response(ex7.RESULT_OK, owners=store.sorted_owners())
+
+def op_scan(store, request):
+    pairs, next_cursor = store.scan_owners(request.get("low"), request.get("high"),
+                                           request.get("cursor"), _whole_number(request, "limit"))
+    owners = [{"owner": owner, "pokedex": pokedex} for owner, pokedex in pairs]
+    return _result_response(ex7.RESULT_OK, owners=owners, cursor=next_cursor)
+
+def op_page(store, request):
+    pairs = store.owners_page(_whole_number(request, "page"), _whole_number(request, "size"))
+    owners = [{"owner": owner, "pokedex": pokedex} for owner, pokedex in pairs]
+    return _result_response(ex7.RESULT_OK, owners=owners)
+
+def op_memory(store, request):
+    if not hasattr(store, "memory_report"):
+        return {"ok": False, "error": "this store has no memory report"}
+    return _result_response(ex7.RESULT_OK, report=store.memory_report())
+
+def op_changes(store, request):
+    feed = getattr(store, "feed", None)
+    if feed is None:
+        return {"ok": False, "error": "this store has no change feed"}
+    since = _whole_number(request, "since", 0)
+    limit = _whole_number(request, "limit")
+    if since < 0 or (limit is not None and limit < 1):
+        raise ValueError("since must be >= 0 and limit >= 1")
+    events = feed.events_since(since, limit)
+    if events is None:
+        return {"ok": False, "error": "events trimmed or state reset, fetch a full traversal", "trimmed": True}
+    last_seq = events[-1]["seq"] if events else since
+    return _result_response(ex7.RESULT_OK, events=events, last_seq=last_seq)
+
+# op name -> handler(store, request) -> response dict
+OPERATIONS = {
+    "create": op_create,
+    "find": op_find,
+    "delete": op_delete,
+    "add": op_add,
+    "release": op_release,
+    "evolve": op_evolve,
+    "filter": op_filter,
+    "sorted": op_sorted,
+    "scan": op_scan,
+    "page": op_page,
+    "memory": op_memory,
+    "changes": op_changes,
+}
+
+
+########################
+# 2) Server
+########################
+
+class _Connection:
+    """
+    One client connection: a reader task parses lines into a bounded queue, and a
+    writer task answers them in order, buffering writes and draining on backpressure.
+    Store calls run in the loop's thread pool, so a big query (or a lock wait) on one
+    connection doesn't stall the others.
+    """
+
+    def __init__(self, store, reader, writer):
+        self.store = store
+        self.reader = reader
+        self.writer = writer
+        # bounded, so a client that pipelines faster than we answer stops being read
+        self.queue = asyncio.Queue(MAX_PIPELINE)
+        self.writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER)
+
+    async def run(self):
+        read_task = asyncio.create_task(self._read_loop())
+        try:
+            await self._answer_loop()
+        finally:
+            read_task.cancel()
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    await self.queue.put(line)
+        except ConnectionError:
+            pass
+        except (ValueError, asyncio.LimitOverrunError):
+            # readline() gives up on lines over MAX_LINE; answer after the queued requests
+            await self.queue.put(_LINE_TOO_LONG)
+        # None marks end of input
+        await self.queue.put(None)
+
+    async def _answer_loop(self):
+        while True:
+            line = await self.queue.get()
+            if line is None:
+                return
+            if line is _LINE_TOO_LONG:
+                self._write({"id": None, "ok": False, "error": "line too long"})
+                await self.writer.drain()
+                return
+            try:
+                request = json.loads(line)
+            except ValueError:
+                self._write({"id": None, "ok": False, "error": "invalid JSON"})
+                await self._maybe_drain()
+                continue
+            request_id = request.get("id") if isinstance(request, dict) else None
+            op = request.get("op") if isinstance(request, dict) else None
+            if op == "traverse":
+                try:
+                    await self._stream_traversal(request_id, request)
+                except BAD_ARGUMENT_ERRORS as e:
+                    # also ends a stream that failed part way, so the client isn't left waiting
+                    self._write({"id": request_id, "ok": False, "error": f"bad arguments: {e}"})
+            elif op in OPERATIONS:
+                try:
+                    response = await self._run(OPERATIONS[op], self.store, request)
+                except BAD_ARGUMENT_ERRORS as e:
+                    response = {"ok": False, "error": f"bad arguments: {e}"}
+                response["id"] = request_id
+                self._write(response)
+            else:
+                self._write({"id": request_id, "ok": False, "error": f"unknown op '{op}'"})
+            # only wait for the client when it's falling behind, and flush once the
+            # pipeline is empty so a lone request isn't held in the buffer
+            await self._maybe_drain()
+
+    async def _stream_traversal(self, request_id, request):
+        order_name = request.get("order", "in")
+        order = ORDER_NAMES.get(order_name) if isinstance(order_name, str) else None
+        if order is None:
+            self._write({"id": request_id, "ok": False, "error": "unknown order"})
+            return
+        if hasattr(self.store, "iter_traverse"):
+            # persistent store: walk one snapshot lazily; SQLite: read it page by page
+            owners = self.store.iter_traverse(order)
+        else:
+            # take a consistent copy under the store's read lock (off the loop)
+            owners = iter(await self._run(self.store.traverse, order))
+        count = 0
+        while True:
+            # advance the walk in the thread pool too, a chunk at a time
+            chunk = await self._run(_take, owners, TRAVERSE_CHUNK)
+            for owner, pokedex in chunk:
+                self._write({"id": request_id, "owner": owner, "pokedex": pokedex})
+            count += len(chunk)
+            if len(chunk) < TRAVERSE_CHUNK:
+                break
+            await self._maybe_drain()
+        self._write({"id": request_id, "ok": True, "done": True, "count": count})
+
+    async def _run(self, funct, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, funct, *args)
+
+    def _write(self, response):
+        self.writer.write(json.dumps(response).encode() + b"\n")
+
+    async def _maybe_drain(self):
+        # drain() only blocks while the transport is above its high-water mark
+        if self.writer.transport.get_write_buffer_size() >= WRITE_HIGH_WATER or self.queue.empty():
+            await self.writer.drain()
+
+
+def _take(iterator, count):
+    return list(itertools.islice(iterator, count))
+
+
+async def start_server(store=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Start serving the store (a new empty OwnerStore with a change feed by default).
+    Return the asyncio server.
+    """
+    if store is None:
+        store = OwnerStore(feed=change_feed.ChangeFeed())
+
+    async def handle(reader, writer):
+        try:
+            await _Connection(store, reader, writer).run()
+        except (ConnectionError, asyncio.CancelledError):
+            # client went away, or the server is shutting down with this connection open
+            pass
+
+    return await asyncio.start_server(handle, host, port, limit=MAX_LINE)
+
+
+async def serve_forever(store=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = await start_server(store, host=host, port=port)
+    print(f"Pokedex server listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+########################
+# 3) Load Generator
+########################
+
+def _random_request(rng, owner_names):
+    """
+    Build a random request over the pre-created owners (mostly reads).
+    """
+    owner = rng.choice(owner_names)
+    pick = rng.random()
+    if pick < 0.4:
+        return {"op": "find", "owner": owner}
+    if pick < 0.6:
+        return {"op": "filter", "owner": owner, "filter": "attack", "value": rng.randint(30, 120)}
+    if pick < 0.75:
+        return {"op": "add", "owner": owner, "poke_id": rng.randint(1, len(ex7.HOENN_DATA))}
+    if pick < 0.85:
+        return {"op": "release", "owner": owner, "name": rng.choice(ex7.HOENN_DATA)["Name"]}
+    if pick < 0.98:
+        return {"op": "evolve", "owner": owner, "name": rng.choice(ex7.HOENN_DATA)["Name"]}
+    # whole-store reads are rare but big (one line per owner for traverse)
+    if pick < 0.998:
+        return {"op": "sorted"}
+    return {"op": "traverse", "order": "in"}
+
+
+async def _client_worker(host, port, owner_names, num_requests, depth, seed, latencies):
+    """
+    One connection keeping up to 'depth' requests in flight; records each latency.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port, limit=16 * 1024 * 1024)
+    sent_at = {}
+    window = asyncio.Semaphore(depth)
+
+    async def send_all():
+        for i in range(num_requests):
+            await window.acquire()
+            request = _random_request(rng, owner_names)
+            request["id"] = i
+            sent_at[i] = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+
+    sender = asyncio.create_task(send_all())
+    answered = 0
+    while answered < num_requests:
+        response = json.loads(await reader.readline())
+        # traversal lines without "ok" are partial results
+        if "ok" not in response:
+            continue
+        latencies.append(time.perf_counter() - sent_at.pop(response["id"]))
+        answered += 1
+        window.release()
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def load_test(host=DEFAULT_HOST, port=DEFAULT_PORT, connections=16, requests_per_connection=2000,
+                    depth=8, num_owners=1000):
+    """
+    Create owners, then fire requests from many pipelined connections.
+    Print and return (p50 seconds, p99 seconds, requests/sec).
+    """
+    owner_names = [f"LoadOwner{i:05d}" for i in range(num_owners)]
+    setup_order = list(owner_names)
+    random.Random(0).shuffle(setup_order)
+    reader, writer = await asyncio.open_connection(host, port)
+    for i, name in enumerate(setup_order):
+        writer.write(json.dumps({"id": i, "op": "create", "owner": name, "starter": i % 3 + 1}).encode() + b"\n")
+    await writer.drain()
+    for _ in setup_order:
+        await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client_worker(host, port, owner_names, requests_per_connection, depth, seed, latencies)
+        for seed in range(connections)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = _percentile(latencies, 0.50)
+    p99 = _percentile(latencies, 0.99)
+    rps = len(latencies) / elapsed
+    print(f"connections: {connections}  depth: {depth}  requests: {len(latencies)}")
+    print(f"p50: {p50 * 1000:.3f} ms  p99: {p99 * 1000:.3f} ms  requests/sec: {rps:.0f}")
+    return p50, p99, rps
+
+
+async def _serve_and_load_test():
+    # ephemeral port on localhost, so the benchmark never clashes with a running server
+    server = await start_server(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        return await load_test(port=port)
+
+
+def main():
+    """
+    python pokedex_server.py serve [port] [sqlite file]  -> run the server (in memory, or on an SQLite file)
+    python pokedex_server.py bench                       -> run a local server plus the load generator
+    """
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    if command == "bench":
+        asyncio.run(_serve_and_load_test())
+    elif command == "serve":
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+        store = SqliteOwnerStore(sys.argv[3]) if len(sys.argv) > 3 else None
+        asyncio.run(serve_forever(store, port=port))
+    else:
+        print(main.__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,542 @@
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import ex7
+from owner_store import OwnerStore
+
+########################
+# 0) Schema & Statements
+########################
+
+# Owners are keyed by their lowercase name (the same key the BST orders by).
+# pokemon_count is kept next to the owner so the "sorted by number of Pokemon"
+# report is an index scan. Pokedex rows keep their insertion order in 'position'.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS species (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    type_key TEXT NOT NULL,
+    hp INTEGER NOT NULL,
+    attack INTEGER NOT NULL,
+    can_evolve TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS owners (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE,
+    pokemon_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS owners_by_count ON owners (pokemon_count, name_key);
+CREATE TABLE IF NOT EXISTS pokedex (
+    owner_id INTEGER NOT NULL REFERENCES owners (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    species_id INTEGER NOT NULL REFERENCES species (id),
+    PRIMARY KEY (owner_id, position),
+    UNIQUE (owner_id, species_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pokedex_by_species ON pokedex (species_id, owner_id);
+"""
+
+# SQL is kept in constants so sqlite3's per-connection statement cache reuses the
+# prepared statements instead of re-parsing them on every call.
+SQL_UPSERT_SPECIES = ("INSERT OR REPLACE INTO species (id, name, name_key, type_key, hp, attack, can_evolve) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?)")
+SQL_FIND_OWNER = "SELECT id, name FROM owners WHERE name_key = ?"
+SQL_INSERT_OWNER = "INSERT INTO owners (name, name_key, pokemon_count) VALUES (?, ?, 0)"
+SQL_DELETE_OWNER = "DELETE FROM owners WHERE id = ?"
+SQL_DELETE_OWNER_POKEDEX = "DELETE FROM pokedex WHERE owner_id = ?"
+SQL_NEXT_POSITION = "SELECT COALESCE(MAX(position), -1) + 1 FROM pokedex WHERE owner_id = ?"
+SQL_HAS_SPECIES = "SELECT 1 FROM pokedex WHERE owner_id = ? AND species_id = ?"
+SQL_INSERT_ENTRY = "INSERT INTO pokedex (owner_id, position, species_id) VALUES (?, ?, ?)"
+SQL_DELETE_ENTRY = "DELETE FROM pokedex WHERE owner_id = ? AND species_id = ?"
+SQL_BUMP_COUNT = "UPDATE owners SET pokemon_count = pokemon_count + ? WHERE id = ?"
+SQL_FIRST_BY_NAME = ("SELECT p.species_id FROM pokedex p JOIN species s ON s.id = p.species_id "
+                     "WHERE p.owner_id = ? AND s.name_key = ? ORDER BY p.position LIMIT 1")
+SQL_POKEDEX = "SELECT species_id FROM pokedex WHERE owner_id = ? ORDER BY position"
+SQL_OWNER_COUNT = "SELECT COUNT(*) FROM owners"
+SQL_SORTED_OWNERS = "SELECT name, pokemon_count FROM owners ORDER BY pokemon_count, name_key"
+# whole-store reads go a page of owners at a time (keyset on name_key), so they never
+# hold more than one page in memory
+SQL_FIRST_OWNER_KEYS = "SELECT name_key FROM owners ORDER BY name_key LIMIT ?"
+SQL_NEXT_OWNER_KEYS = "SELECT name_key FROM owners WHERE name_key > ? ORDER BY name_key LIMIT ?"
+SQL_OWNERS_ALPHA = ("SELECT o.name, p.species_id FROM owners o LEFT JOIN pokedex p ON p.owner_id = o.id "
+                    "WHERE o.name_key BETWEEN ? AND ? ORDER BY o.name_key, p.position")
+
+# display filter -> (SQL condition on species 's', value -> parameters)
+# lowercasing happens in Python so it matches the ex7 filters exactly
+FILTER_CONDITIONS = {
+    ex7.DISP_CERTAIN_TYPE: ("s.type_key = ?", lambda value: (value.lower(),)),
+    ex7.DISP_EVOLVABLE: ("s.can_evolve = 'TRUE'", lambda value: ()),
+    ex7.DISP_ATTACK_ABOVE: ("s.attack > ?", lambda value: (value,)),
+    ex7.DISP_HP_ABOVE: ("s.hp > ?", lambda value: (value,)),
+    ex7.DISP_NAME_STARTS: ("substr(s.name_key, 1, length(?)) = ?", lambda value: (value.lower(), value.lower())),
+    ex7.DISP_ALL: ("1", lambda value: ()),
+}
+SQL_FILTER_OWNER = ("SELECT p.species_id FROM pokedex p JOIN species s ON s.id = p.species_id "
+                    "WHERE p.owner_id = ? AND {condition} ORDER BY p.position")
+SQL_FILTER_ALL = ("SELECT o.name, p.species_id FROM owners o "
+                  "JOIN pokedex p ON p.owner_id = o.id JOIN species s ON s.id = p.species_id "
+                  "WHERE o.name_key BETWEEN ? AND ? AND {condition} ORDER BY o.name_key, p.position")
+# selective filters start from the matching species and reach their entries through
+# pokedex_by_species (CROSS JOIN keeps that join order), a page of rows at a time
+# (keyset on name_key, position)
+SQL_FILTER_SPECIES_COUNT = "SELECT COUNT(*) FROM species s WHERE {condition}"
+SQL_FILTER_MATCH_COUNT = ("SELECT COUNT(*) FROM species s CROSS JOIN pokedex p "
+                          "WHERE p.species_id = s.id AND {condition}")
+SQL_FILTER_FIRST_ROWS = ("SELECT o.name, o.name_key, p.position, p.species_id "
+                         "FROM species s CROSS JOIN pokedex p CROSS JOIN owners o "
+                         "WHERE p.species_id = s.id AND o.id = p.owner_id AND {condition} "
+                         "ORDER BY o.name_key, p.position LIMIT ?")
+SQL_FILTER_NEXT_ROWS = ("SELECT o.name, o.name_key, p.position, p.species_id "
+                        "FROM species s CROSS JOIN pokedex p CROSS JOIN owners o "
+                        "WHERE p.species_id = s.id AND o.id = p.owner_id AND {condition} "
+                        "AND (o.name_key, p.position) > (?, ?) "
+                        "ORDER BY o.name_key, p.position LIMIT ?")
+
+# owners per page of a whole-store read
+OWNER_PAGE_SIZE = 1000
+# a filter matching at most 1 in SPECIES_DRIVEN_SHARE species is read species first;
+# broader ones (a type, evolvable, all) go owner by owner, which measured faster once
+# ~1 in 6 species match
+SPECIES_DRIVEN_SHARE = 16
+# rows per page of a species-first filter: at least FILTER_PAGE_ROWS, and big enough to
+# finish in FILTER_MAX_PASSES pages, since every page re-reads all the matching entries
+FILTER_PAGE_ROWS = 10000
+FILTER_MAX_PASSES = 4
+
+
+########################
+# 1) SQLite Owner Store
+########################
+
+
+class SqliteOwnerStore:
+    """
+    OwnerStore interface backed by an SQLite file, for owner populations bigger than RAM.
+    Each mutation is its own transaction unless it runs inside a batch() block, which
+    commits once at the end. Filters and the sorted-by-count report run as indexed SQL.
+    One connection is shared by all threads, guarded by a lock.
+    Owner order is alphabetical (by lowercase name) for every traversal order, since there
+    is no tree shape on disk. iter_traverse() and iter_filter_all_owners() are generators
+    reading a page at a time; each page is consistent, the whole walk is not a snapshot.
+    """
+
+    def __init__(self, path=":memory:", timeout=5.0):
+        # timeout: seconds to wait for another connection's write lock on the file
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None,
+                                     check_same_thread=False, cached_statements=256)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        # species ID -> the shared HOENN_DATA dict, so results compare equal to the BST stores
+        self._species = {poke['ID']: poke for poke in ex7.HOENN_DATA}
+        with self.batch():
+            self._conn.executemany(SQL_UPSERT_SPECIES, [
+                (poke['ID'], poke['Name'], poke['Name'].lower(), poke['Type'].lower(),
+                 poke['HP'], poke['Attack'], poke['Can Evolve'])
+                for poke in ex7.HOENN_DATA])
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # --- transactions ---
+
+    def batch(self):
+        """
+        Context manager grouping every mutation inside it into one transaction.
+        """
+        return _Batch(self)
+
+    def _begin(self):
+        self._lock.acquire()
+        self._batch_depth += 1
+        try:
+            if self._batch_depth == 1:
+                self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            # e.g. the file is locked by another connection: nothing was started
+            self._batch_depth -= 1
+            self._lock.release()
+            raise
+
+    def _end(self, commit):
+        self._batch_depth -= 1
+        try:
+            if self._batch_depth == 0:
+                try:
+                    self._conn.execute("COMMIT" if commit else "ROLLBACK")
+                except BaseException:
+                    # a failed COMMIT leaves the transaction open, don't leave it behind
+                    if self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+                    raise
+        finally:
+            self._lock.release()
+
+    def _owner_row(self, owner_name):
+        return self._conn.execute(SQL_FIND_OWNER, (owner_name.lower(),)).fetchone()
+
+    def _dicts(self, rows):
+        return [self._species[row[0]] for row in rows]
+
+    # --- writers ---
+
+    def create_owner(self, owner_name, starter_name):
+        starter = ex7.get_poke_dict_by_name(starter_name)
+        if not starter:
+            return ex7.RESULT_NOT_FOUND
+        with self.batch():
+            if self._owner_row(owner_name):
+                return ex7.RESULT_DUPLICATE
+            owner_id = self._conn.execute(SQL_INSERT_OWNER, (owner_name, owner_name.lower())).lastrowid
+            self._append(owner_id, starter['ID'])
+        return ex7.RESULT_OK
+
+    def delete_owner(self, owner_name):
+        with self.batch():
+            row = self._owner_row(owner_name)
+            if not row:
+                return ex7.RESULT_NO_OWNER
+            self._conn.execute(SQL_DELETE_OWNER_POKEDEX, (row[0],))
+            self._conn.execute(SQL_DELETE_OWNER, (row[0],))
+        return ex7.RESULT_OK
+
+    def _append(self, owner_id, species_id):
+        position = self._conn.execute(SQL_NEXT_POSITION, (owner_id,)).fetchone()[0]
+        self._conn.execute(SQL_INSERT_ENTRY, (owner_id, position, species_id))
+        self._conn.execute(SQL_BUMP_COUNT, (1, owner_id))
+
+    def _remove(self, owner_id, species_id):
+        self._conn.execute(SQL_DELETE_ENTRY, (owner_id, species_id))
+        self._conn.execute(SQL_BUMP_COUNT, (-1, owner_id))
+
+    def add_pokemon(self, owner_name, poke_id):
+        with self.batch():
+            row = self._owner_row(owner_name)
+            if not row:
+                return ex7.RESULT_NO_OWNER, None
+            pokemon = self._species.get(poke_id)
+            if not pokemon:
+                return ex7.RESULT_NOT_FOUND, None
+            if self._conn.execute(SQL_HAS_SPECIES, (row[0], poke_id)).fetchone():
+                return ex7.RESULT_DUPLICATE, pokemon
+            self._append(row[0], poke_id)
+        return ex7.RESULT_OK, pokemon
+
+    def release_pokemon(self, owner_name, poke_name):
+        with self.batch():
+            row = self._owner_row(owner_name)
+            if not row:
+                return ex7.RESULT_NO_OWNER, None
+            found = self._conn.execute(SQL_FIRST_BY_NAME, (row[0], poke_name.lower())).fetchone()
+            if not found:
+                return ex7.RESULT_NOT_FOUND, None
+            self._remove(row[0], found[0])
+        return ex7.RESULT_OK, self._species[found[0]]
+
+    def evolve_pokemon(self, owner_name, poke_name):
+        with self.batch():
+            row = self._owner_row(owner_name)
+            if not row:
+                return ex7.RESULT_NO_OWNER, None, None
+            found = self._conn.execute(SQL_FIRST_BY_NAME, (row[0], poke_name.lower())).fetchone()
+            if not found:
+                return ex7.RESULT_NOT_FOUND, None, None
+            pokemon = self._species[found[0]]
+            if pokemon['Can Evolve'] == "FALSE":
+                return ex7.RESULT_CANNOT_EVOLVE, pokemon, None
+            # same rules as ex7.evolve_pokemon: the evolution is the next ID
+            evolution = self._species.get(pokemon['ID'] + 1)
+            if evolution is None:
+                return ex7.RESULT_CANNOT_EVOLVE, pokemon, None
+            already_there = self._conn.execute(SQL_HAS_SPECIES, (row[0], evolution['ID'])).fetchone()
+            self._remove(row[0], pokemon['ID'])
+            if already_there:
+                return ex7.RESULT_DUPLICATE, pokemon, evolution
+            self._append(row[0], evolution['ID'])
+        return ex7.RESULT_OK, pokemon, evolution
+
+    def bulk_load(self, entries):
+        """
+        Create owners from (owner name, starter name, [pokemon IDs]) entries in one transaction.
+        Return how many owners were created.
+        """
+        created = 0
+        with self.batch():
+            for owner_name, starter_name, poke_ids in entries:
+                if self.create_owner(owner_name, starter_name) != ex7.RESULT_OK:
+                    continue
+                created += 1
+                owner_id = self._owner_row(owner_name)[0]
+                # dedupe like add_pokemon would, keeping the starter first
+                fresh = []
+                seen = {ex7.get_poke_dict_by_name(starter_name)['ID']}
+                for poke_id in poke_ids:
+                    if poke_id in self._species and poke_id not in seen:
+                        seen.add(poke_id)
+                        fresh.append(poke_id)
+                self._conn.executemany(SQL_INSERT_ENTRY, [(owner_id, i + 1, poke_id) for i, poke_id in enumerate(fresh)])
+                self._conn.execute(SQL_BUMP_COUNT, (len(fresh), owner_id))
+        return created
+
+    # --- readers ---
+
+    def get_pokedex(self, owner_name):
+        with self._lock:
+            row = self._owner_row(owner_name)
+            if not row:
+                return None
+            return self._dicts(self._conn.execute(SQL_POKEDEX, (row[0],)))
+
+    def filter_pokedex(self, owner_name, choice, value=None):
+        with self._lock:
+            row = self._owner_row(owner_name)
+            if not row or choice not in FILTER_CONDITIONS:
+                return None
+            condition, params = FILTER_CONDITIONS[choice]
+            sql = SQL_FILTER_OWNER.format(condition=condition)
+            return self._dicts(self._conn.execute(sql, (row[0],) + params(value)))
+
+    def owner_count(self):
+        with self._lock:
+            return self._conn.execute(SQL_OWNER_COUNT).fetchone()[0]
+
+    def sorted_owners(self):
+        with self._lock:
+            return [[name, count] for name, count in self._conn.execute(SQL_SORTED_OWNERS)]
+
+    def filter_all_owners(self, choice, value=None):
+        """
+        Return (owner name, matches) pairs alphabetically, skipping owners with no matches.
+        """
+        return list(self.iter_filter_all_owners(choice, value))
+
+    def iter_filter_all_owners(self, choice, value=None):
+        """
+        Yield filter_all_owners() pairs lazily, a page at a time.
+        """
+        if choice not in FILTER_CONDITIONS:
+            return
+        condition, params = FILTER_CONDITIONS[choice]
+        params = tuple(params(value))
+        with self._lock:
+            species = self._conn.execute(SQL_FILTER_SPECIES_COUNT.format(condition=condition),
+                                         params).fetchone()[0]
+        if species * SPECIES_DRIVEN_SHARE <= len(self._species):
+            yield from self._iter_matches(condition, params)
+        else:
+            yield from self._iter_pages(SQL_FILTER_ALL.format(condition=condition), params)
+
+    def traverse(self, order=ex7.PRINT_OWNER_IN):
+        """
+        Return (owner name, pokedex) pairs alphabetically (whatever the order).
+        """
+        return list(self.iter_traverse(order))
+
+    def iter_traverse(self, order=ex7.PRINT_OWNER_IN):
+        """
+        Yield traverse() pairs lazily, a page of owners at a time.
+        """
+        yield from self._iter_pages(SQL_OWNERS_ALPHA, ())
+
+    def _iter_pages(self, sql, params):
+        """
+        Run sql (rows of owner name, species ID or None, for owner keys BETWEEN ? AND ?)
+        over one page of owners at a time, yielding (owner, pokedex) pairs.
+        """
+        last_key = None
+        while True:
+            with self._lock:
+                if last_key is None:
+                    keys = self._conn.execute(SQL_FIRST_OWNER_KEYS, (OWNER_PAGE_SIZE,)).fetchall()
+                else:
+                    keys = self._conn.execute(SQL_NEXT_OWNER_KEYS, (last_key, OWNER_PAGE_SIZE)).fetchall()
+                if not keys:
+                    return
+                last_key = keys[-1][0]
+                rows = self._conn.execute(sql, (keys[0][0], last_key) + tuple(params)).fetchall()
+            # yield outside the lock, so a slow consumer doesn't block writers
+            yield from self._group(rows)
+            if len(keys) < OWNER_PAGE_SIZE:
+                return
+
+    def _iter_matches(self, condition, params):
+        """
+        Yield (owner, matches) pairs of a selective filter, reading the matching pokedex
+        entries species first, a page of rows at a time. An owner whose entries span two
+        pages is held back until the next page completes it.
+        """
+        with self._lock:
+            matches = self._conn.execute(SQL_FILTER_MATCH_COUNT.format(condition=condition),
+                                         params).fetchone()[0]
+        page_rows = max(FILTER_PAGE_ROWS, -(-matches // FILTER_MAX_PASSES))
+        first_sql = SQL_FILTER_FIRST_ROWS.format(condition=condition)
+        next_sql = SQL_FILTER_NEXT_ROWS.format(condition=condition)
+        last_row = None
+        pending = None  # [name key, name, matches] of the page's last owner
+        while True:
+            with self._lock:
+                if last_row is None:
+                    rows = self._conn.execute(first_sql, params + (page_rows,)).fetchall()
+                else:
+                    rows = self._conn.execute(next_sql, params + last_row + (page_rows,)).fetchall()
+            done = []
+            for name, name_key, position, species_id in rows:
+                if pending is None or pending[0] != name_key:
+                    if pending is not None:
+                        done.append((pending[1], pending[2]))
+                    pending = [name_key, name, []]
+                pending[2].append(self._species[species_id])
+            yield from done
+            if len(rows) < page_rows:
+                break
+            last_row = (rows[-1][1], rows[-1][2])
+        if pending is not None:
+            yield pending[1], pending[2]
+
+    def _group(self, rows):
+        """
+        Turn (owner name, species ID or None) rows, sorted by owner, into (owner, pokedex) pairs.
+        """
+        result = []
+        for name, species_id in rows:
+            if not result or result[-1][0] != name:
+                result.append((name, []))
+            if species_id is not None:
+                result[-1][1].append(self._species[species_id])
+        return result
+
+    def scan_owners(self, low=None, high=None, cursor=None, limit=None):
+        """
+        Return ((owner name, pokedex) pairs, next cursor), see ex7.scan_owners.
+        """
+        ex7.check_scan_limit(limit)
+        conditions, params = [], []
+        if low is not None:
+            conditions.append("name_key >= ?")
+            params.append(low.lower())
+        if high is not None:
+            conditions.append("name_key <= ?")
+            params.append(high.lower())
+        if cursor:
+            conditions.append("name_key > ?")
+            params.append(ex7.decode_owner_cursor(cursor))
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        # one extra row tells us whether there is another page
+        fetch = -1 if limit is None else limit + 1
+        with self._lock:
+            owners = self._conn.execute(f"SELECT id, name FROM owners{where} ORDER BY name_key LIMIT ?",
+                                        params + [fetch]).fetchall()
+            next_cursor = None
+            if limit is not None and len(owners) > limit:
+                owners = owners[:limit]
+                next_cursor = ex7.encode_owner_cursor(owners[-1][1])
+            return self._with_pokedexes(owners), next_cursor
+
+    def owners_page(self, page_number, page_size):
+        ex7.check_page_args(page_number, page_size)
+        with self._lock:
+            owners = self._conn.execute("SELECT id, name FROM owners ORDER BY name_key LIMIT ? OFFSET ?",
+                                        (page_size, page_number * page_size)).fetchall()
+            return self._with_pokedexes(owners)
+
+    def _with_pokedexes(self, owners):
+        return [(name, self._dicts(self._conn.execute(SQL_POKEDEX, (owner_id,)))) for owner_id, name in owners]
+
+
+class _Batch:
+    def __init__(self, store):
+        self._store = store
+
+    def __enter__(self):
+        self._store._begin()
+        return self._store
+
+    def __exit__(self, exc_type, *exc):
+        self._store._end(commit=exc_type is None)
+        return False
+
+
+########################
+# 2) Benchmark
+########################
+
+
+def _random_entries(num_entries, seed=0):
+    """
+    About 10 Pokemon per owner, owners in random order.
+    """
+    rng = random.Random(seed)
+    entries = []
+    num_owners = max(1, num_entries // 10)
+    for i in range(num_owners):
+        poke_ids = rng.sample(range(1, len(ex7.HOENN_DATA) + 1), rng.randint(0, 18))
+        entries.append((f"Owner{i:08d}", ex7.STARTERS[i % 3 + 1], poke_ids))
+    rng.shuffle(entries)
+    return entries
+
+
+def _time(label, funct):
+    start = time.perf_counter()
+    funct()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:28s} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+def benchmark(sizes=(10 ** 5,), point_ops=2000):
+    """
+    Compare the in-memory OwnerStore with an SQLite file store at each number of
+    pokedex entries: load, point lookups / edits, sorted report and a global filter.
+    """
+    for num_entries in sizes:
+        entries = _random_entries(num_entries)
+        names = [entry[0] for entry in entries]
+        rng = random.Random(1)
+        lookups = [rng.choice(names) for _ in range(point_ops)]
+
+        def point_workload(store):
+            for i, name in enumerate(lookups):
+                store.get_pokedex(name)
+                if i % 4 == 0:
+                    store.add_pokemon(name, rng.randint(1, len(ex7.HOENN_DATA)))
+
+        print(f"\n{num_entries} entries, {len(entries)} owners")
+        print(" in-memory BST")
+        memory_store = OwnerStore()
+        _time("load", lambda: memory_store.bulk_load(entries))
+        _time(f"{point_ops} lookups (+edits)", lambda: point_workload(memory_store))
+        _time("sorted_owners", memory_store.sorted_owners)
+        _time("filter_all_owners(attack>140)", lambda: memory_store.filter_all_owners(ex7.DISP_ATTACK_ABOVE, 140))
+        _time("traverse", memory_store.traverse)
+        del memory_store
+
+        print(" sqlite")
+        with tempfile.TemporaryDirectory() as tmp:
+            with SqliteOwnerStore(os.path.join(tmp, "owners.db")) as sql_store:
+                _time("load", lambda: sql_store.bulk_load(entries))
+                _time(f"{point_ops} lookups (+edits)", lambda: point_workload(sql_store))
+                _time("sorted_owners", sql_store.sorted_owners)
+                _time("filter_all_owners(attack>140)",
+                      lambda: sql_store.filter_all_owners(ex7.DISP_ATTACK_ABOVE, 140))
+                _time("traverse", sql_store.traverse)
+
+
+if __name__ == "__main__":
+    benchmark([int(arg) for arg in sys.argv[1:]] or (10 ** 5,))
@@ -0,0 +1,89 @@
+import os
+
+import catalog
+
+HEADER = "ID,Name,Type,HP,Attack,Can Evolve\n"
+
+
+def _write_csv(tmp_path, filename, rows, header=HEADER):
+    path = tmp_path / filename
+    path.write_text(header + "".join(row + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+
+def test_blank_rows_are_skipped_not_the_end_of_the_file(tmp_path):
+    path = _write_csv(tmp_path, "kanto.csv", [
+        "1,Bulbasaur,Grass,45,49,TRUE",
+        "",
+        " , , ",
+        "2,Ivysaur,Grass,60,62,TRUE",
+    ])
+    cat = catalog.new_catalog()
+    assert catalog.add_source(cat, path, "kanto", 0) == 2
+    assert [poke['Name'] for poke in catalog.region_species(cat, "kanto")] == ["Bulbasaur", "Ivysaur"]
+    assert cat['errors'] == []
+
+
+def test_bad_values_are_recorded_and_skipped(tmp_path):
+    path = _write_csv(tmp_path, "kanto.csv", [
+        "x,Bulbasaur,Grass,45,49,TRUE",
+        "2,Ivysaur,Grass,lots,62,TRUE",
+        "3,Venusaur,Grass,80,82,MAYBE",
+        "4,Charmander,Fire,39,52,true",
+    ])
+    cat = catalog.new_catalog()
+    assert catalog.add_source(cat, path, "kanto", 0) == 1
+    assert catalog.find_species(cat, "kanto", 4)['Can Evolve'] == "TRUE"
+    # the header is line 1
+    assert [error.split(": ")[0] for error in cat['errors']] == ["kanto.csv:2", "kanto.csv:3", "kanto.csv:4"]
+    assert "whole numbers" in cat['errors'][0] and "whole numbers" in cat['errors'][1]
+    assert "MAYBE" in cat['errors'][2]
+
+
+def test_unexpected_header_loads_nothing(tmp_path):
+    path = _write_csv(tmp_path, "kanto.csv", ["1,Bulbasaur,Grass,45,49,TRUE"],
+                      header="Number,Name,Type,HP,Attack,Evolves\n")
+    cat = catalog.new_catalog()
+    assert catalog.add_source(cat, path, "kanto", 0) == 0
+    assert catalog.region_species(cat, "kanto") == []
+    assert len(cat['errors']) == 1 and "unexpected header" in cat['errors'][0]
+
+
+def test_colliding_global_ids_keep_the_first_region(tmp_path):
+    kanto = _write_csv(tmp_path, "kanto.csv", ["1,Bulbasaur,Grass,45,49,TRUE",
+                                               "2,Ivysaur,Grass,60,62,TRUE",
+                                               "3,Venusaur,Grass,80,82,FALSE"])
+    # offset 1 maps johto's 1 and 2 onto kanto's global 2 and 3
+    johto = _write_csv(tmp_path, "johto.csv", ["1,Chikorita,Grass,45,49,TRUE",
+                                               "2,Bayleef,Grass,60,62,TRUE",
+                                               "3,Meganium,Grass,80,82,FALSE"])
+    cat = catalog.load_catalog([(kanto, "kanto", 0), (johto, "johto", 1)])
+    assert catalog.find_global(cat, 2)['Name'] == "Ivysaur"
+    assert catalog.find_global(cat, 3)['Name'] == "Venusaur"
+    assert catalog.find_global(cat, 4)['Name'] == "Meganium"
+    assert catalog.find_species(cat, "johto", 1) is None
+    assert [poke['Name'] for poke in catalog.region_species(cat, "johto")] == ["Meganium"]
+    assert cat['errors'] == ["johto.csv:2: global ID 2 already used", "johto.csv:3: global ID 3 already used"]
+
+
+def test_reloading_a_region_with_another_offset_is_refused(tmp_path):
+    path = _write_csv(tmp_path, "hoenn.csv", ["1,Treecko,Grass,40,45,TRUE"])
+    cat = catalog.new_catalog()
+    assert catalog.add_source(cat, path, "hoenn", 251) == 1
+    assert catalog.add_source(cat, path, "hoenn", 386) == 0
+    assert catalog.find_global(cat, 252)['Name'] == "Treecko"
+    assert catalog.find_global(cat, 387) is None
+    assert cat['errors'] == [f"{path}: region 'hoenn' already loaded with offset 251"]
+
+
+def test_find_global_and_sprite_path(tmp_path):
+    path = _write_csv(tmp_path, "hoenn.csv", ["1,Treecko,Grass,40,45,TRUE",
+                                              "2,Grovyle,Grass,50,65,TRUE"])
+    cat = catalog.new_catalog()
+    catalog.add_source(cat, path, "hoenn", 251)
+    grovyle = catalog.find_global(cat, 253)
+    assert grovyle is catalog.find_species_by_name(cat, "hoenn", "Grovyle")
+    assert grovyle['ID'] == 2 and grovyle['Region'] == "hoenn"
+    assert catalog.find_global(cat, 2) is None
+    assert catalog.sprite_path(grovyle['Global ID'], str(tmp_path)) == os.path.join(str(tmp_path), "253.png")
+    assert catalog.sprite_path(252) == os.path.join(catalog.SPRITE_DIR, "252.png")
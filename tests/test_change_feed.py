@@ -0,0 +1,121 @@
+import random
+import threading
+
+import pytest
+
+import change_feed
+import ex7
+from owner_store import OwnerStore
+from persistent_tree import PersistentOwnerStore
+
+OWNER_NAMES = [f"Ash{i}" for i in range(40)] + [f"ash{i}" for i in range(5)]
+
+
+def random_operations(store, rng, count):
+    for _ in range(count):
+        owner = rng.choice(OWNER_NAMES)
+        roll = rng.random()
+        if roll < 0.15:
+            store.create_owner(owner, rng.choice(list(ex7.STARTERS.values())))
+        elif roll < 0.22:
+            store.delete_owner(owner)
+        elif roll < 0.6:
+            store.add_pokemon(owner, rng.randint(1, 140))
+        else:
+            pokedex = store.get_pokedex(owner)
+            if not pokedex:
+                continue
+            name = rng.choice(pokedex)['Name']
+            if roll < 0.8:
+                store.release_pokemon(owner, name)
+            else:
+                store.evolve_pokemon(owner, name.upper())
+
+
+def replay(store_factory, events):
+    replica = store_factory()
+    for event in events:
+        change_feed.apply_event(replica, event)
+    return replica
+
+
+@pytest.mark.parametrize("store_factory", [OwnerStore, PersistentOwnerStore])
+def test_replicas_match_source_under_concurrent_writers(store_factory, tmp_path):
+    feed = change_feed.ChangeFeed()
+    source = store_factory(feed=feed)
+    random_operations(source, random.Random(1), 1000)
+    full_file = tmp_path / "full.jsonl"
+    delta_file = tmp_path / "delta.jsonl"
+    full_seq = change_feed.export_full(*source.export_state(), full_file)
+
+    threads = [threading.Thread(target=random_operations, args=(source, random.Random(seed), 800))
+               for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert change_feed.export_delta(feed, full_seq, delta_file) == feed.last_seq()
+
+    # from every event, and from the full export plus the delta after it
+    from_events = replay(store_factory, feed.events_since(0))
+    from_exports = replay(store_factory, change_feed.read_export(full_file) + change_feed.read_export(delta_file))
+    assert from_events.traverse() == source.traverse()
+    assert from_exports.traverse() == source.traverse()
+
+
+def test_events_since_and_trimming():
+    feed = change_feed.ChangeFeed(max_events=3)
+    for i in range(7):
+        feed.publish(change_feed.CHANGE_DELETE, f"owner{i}")
+    assert feed.last_seq() == 7
+    assert feed.events_since(0) is None
+    assert [event['seq'] for event in feed.events_since(4)] == [5, 6, 7]
+    assert [event['seq'] for event in feed.events_since(4, limit=2)] == [5, 6]
+    assert feed.events_since(7) == []
+
+
+def test_subscribe_and_unsubscribe():
+    feed = change_feed.ChangeFeed()
+    seen = []
+    unsubscribe = feed.subscribe(seen.append)
+    feed.publish(change_feed.CHANGE_DELETE, "Ash")
+    unsubscribe()
+    feed.publish(change_feed.CHANGE_DELETE, "Brock")
+    assert [event['owner'] for event in seen] == ["Ash"]
+
+
+def test_unchanged_operations_publish_nothing():
+    feed = change_feed.ChangeFeed()
+    store = OwnerStore(feed=feed)
+    store.create_owner("Ash", "Treecko")
+    store.create_owner("ASH", "Mudkip")
+    store.add_pokemon("Ash", 1)
+    store.release_pokemon("Ash", "Pikachu")
+    store.delete_owner("Misty")
+    assert [event['kind'] for event in feed.events_since(0)] == [change_feed.CHANGE_CREATE]
+
+
+def test_restore_resets_the_feed(tmp_path):
+    feed = change_feed.ChangeFeed()
+    store = PersistentOwnerStore(feed=feed)
+    store.create_owner("Ash", "Treecko")
+    snapshot = store.snapshot()
+    store.create_owner("Brock", "Torchic")
+    store.add_pokemon("Ash", 4)
+    seen = []
+    feed.subscribe(seen.append)
+    store.restore(snapshot)
+
+    assert [event['kind'] for event in seen] == [change_feed.CHANGE_RESET]
+    # a replica replaying old events must not get a delta that misses the restore
+    assert feed.events_since(0) is None
+    assert change_feed.export_delta(feed, 2, tmp_path / "delta.jsonl") is None
+    with pytest.raises(ValueError):
+        change_feed.apply_event(OwnerStore(), seen[0])
+
+    # a full export after the reset plus later deltas rebuild the state
+    seq = change_feed.export_full(*store.export_state(), tmp_path / "full.jsonl")
+    assert seq == seen[0]['seq']
+    store.add_pokemon("Ash", 7)
+    replica = replay(OwnerStore, change_feed.read_export(tmp_path / "full.jsonl") + feed.events_since(seq))
+    assert replica.traverse() == store.traverse()
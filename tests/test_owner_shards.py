@@ -0,0 +1,53 @@
+import pytest
+
+import ex7
+from owner_shards import ShardedOwnerStore, shard_index
+
+
+@pytest.fixture
+def sharded():
+    with ShardedOwnerStore(3) as store:
+        yield store
+
+
+def test_shard_index_ignores_case():
+    assert shard_index("Ash", 7) == shard_index("aSH", 7)
+
+
+def test_failed_scatter_leaves_pipes_in_sync(sharded):
+    for name in ("Ash", "Brock", "Misty", "Gary", "Dawn"):
+        sharded.create_owner(name, "Torchic")
+    # a type filter without a value fails inside every worker
+    with pytest.raises(RuntimeError):
+        sharded.filter_all_owners(ex7.DISP_CERTAIN_TYPE, None)
+    assert sharded.owner_count() == 5
+    assert sharded.get_pokedex("misty")[0]['Name'] == "Torchic"
+
+
+def test_stale_reply_is_skipped(sharded):
+    sharded.create_owner("Ash", "Mudkip")
+    shard = shard_index("Ash", sharded.num_shards)
+    # a call interrupted after sending: its reply is still in the pipe
+    with sharded._locks[shard]:
+        sharded._send(shard, "owner_count", ())
+    assert sharded.get_pokedex("Ash")[0]['Name'] == "Mudkip"
+    assert sharded.owner_count() == 1
+
+
+def test_sharded_matches_single_store(sharded):
+    names = [f"Owner{i:03d}" for i in range(40)]
+    for i, name in enumerate(names):
+        sharded.create_owner(name, ex7.STARTERS[i % 3 + 1])
+        sharded.add_pokemon(name, i % 20 + 1)
+    assert [owner for owner, _ in sharded.traverse()] == names
+    assert sharded.scan_owners("owner010", "owner019", limit=4)[0] == sharded.traverse()[10:14]
+    assert sharded.owners_page(2, 10) == sharded.traverse()[20:30]
+
+
+def test_bad_scan_limit_is_rejected_before_scatter(sharded):
+    sharded.create_owner("Ash", "Mudkip")
+    with pytest.raises(ValueError):
+        sharded.scan_owners(limit=0)
+    with pytest.raises(ValueError):
+        sharded.owners_page(-1, 5)
+    assert sharded.scan_owners(limit=1)[0][0][0] == "Ash"
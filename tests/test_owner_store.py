@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+
+import pytest
+
+import ex7
+from owner_store import OwnerStore, RWLock
+from persistent_tree import PersistentOwnerStore
+from sqlite_store import SqliteOwnerStore
+
+########################
+# 1) RWLock
+########################
+
+
+def test_rwlock_allows_concurrent_readers():
+    lock = RWLock()
+    inside = []
+    both_in = threading.Event()
+
+    def reader():
+        with lock.read_locked():
+            inside.append(1)
+            if len(inside) == 2:
+                both_in.set()
+            both_in.wait(2)
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert both_in.is_set()
+
+
+def test_rwlock_writer_excludes_readers_and_writers():
+    lock = RWLock()
+    state = {'active': 0, 'writer_in': False, 'writer_overlap': False}
+    state_lock = threading.Lock()
+
+    def enter(writer):
+        with state_lock:
+            state['active'] += 1
+            # a writer that finds anyone else inside is a bug
+            if state['active'] > 1 and (writer or state['writer_in']):
+                state['writer_overlap'] = True
+            state['writer_in'] = writer
+
+    def leave():
+        with state_lock:
+            state['active'] -= 1
+            state['writer_in'] = False
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(200):
+            writer = rng.random() < 0.3
+            with (lock.write_locked() if writer else lock.read_locked()):
+                enter(writer)
+                time.sleep(0)
+                leave()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not state['writer_overlap']
+    assert state['active'] == 0
+
+
+def test_rwlock_waiting_writer_blocks_new_readers():
+    lock = RWLock()
+    lock.acquire_read()
+    writer_done = threading.Event()
+
+    def writer():
+        with lock.write_locked():
+            writer_done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    # wait until the writer is queued
+    deadline = time.time() + 2
+    while not lock._writers_waiting and time.time() < deadline:
+        time.sleep(0.001)
+    assert lock._writers_waiting == 1
+
+    second_reader_in = threading.Event()
+
+    def reader():
+        with lock.read_locked():
+            second_reader_in.set()
+
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    # writer preference: the new reader waits behind the queued writer
+    assert not second_reader_in.wait(0.1)
+    lock.release_read()
+    thread.join(2)
+    reader_thread.join(2)
+    assert writer_done.is_set() and second_reader_in.is_set()
+
+
+########################
+# 2) Store Equivalence
+########################
+
+OWNER_NAMES = [f"Ash{i}" for i in range(30)] + ["ash1", "MISTY", "misty", "Brock"]
+
+
+def random_operation(rng):
+    owner = rng.choice(OWNER_NAMES)
+    roll = rng.random()
+    if roll < 0.15:
+        return "create_owner", (owner, rng.choice(list(ex7.STARTERS.values()) + ["Pikachu"]))
+    if roll < 0.22:
+        return "delete_owner", (owner,)
+    if roll < 0.55:
+        return "add_pokemon", (owner, rng.randint(0, len(ex7.HOENN_DATA) + 1))
+    if roll < 0.75:
+        return "release_pokemon", (owner, rng.choice(ex7.HOENN_DATA)['Name'].lower())
+    return "evolve_pokemon", (owner, rng.choice(ex7.HOENN_DATA)['Name'].upper())
+
+
+def store_state(store):
+    return {
+        'count': store.owner_count(),
+        'in_order': store.traverse(ex7.PRINT_OWNER_IN),
+        'sorted': [list(pair) for pair in store.sorted_owners()],
+        'fire': store.filter_all_owners(ex7.DISP_CERTAIN_TYPE, "fire"),
+        'attack': store.filter_all_owners(ex7.DISP_ATTACK_ABOVE, 100),
+        'scan': store.scan_owners("ash1", "ash3", limit=5)[0],
+        'page': store.owners_page(1, 4),
+    }
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_stores_agree_on_random_operations(seed):
+    rng = random.Random(seed)
+    stores = [OwnerStore(), PersistentOwnerStore(), SqliteOwnerStore()]
+    for step in range(1500):
+        method, args = random_operation(rng)
+        results = [getattr(store, method)(*args) for store in stores]
+        assert results[0] == results[1] == results[2], (step, method, args)
+        if step % 250 == 0:
+            states = [store_state(store) for store in stores]
+            assert states[0] == states[1] == states[2], step
+    states = [store_state(store) for store in stores]
+    assert states[0] == states[1] == states[2]
+    stores[2].close()
+
+
+def test_owner_store_survives_concurrent_writers():
+    store = OwnerStore()
+    for name in OWNER_NAMES:
+        store.create_owner(name, ex7.STARTERS[1])
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(500):
+            method, args = random_operation(rng)
+            getattr(store, method)(*args)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # the size fields must still match the tree
+    owners = store.traverse()
+    assert store.owner_count() == len(owners)
+    names = [owner.lower() for owner, _ in owners]
+    assert names == sorted(names)
+
+
+@pytest.mark.parametrize("store_factory", [OwnerStore, PersistentOwnerStore, SqliteOwnerStore])
+def test_scan_and_page_reject_bad_sizes(store_factory):
+    store = store_factory()
+    for name in ("Ash", "Brock", "Misty"):
+        store.create_owner(name, "Mudkip")
+    for limit in (0, -1, "2", 1.5, True):
+        with pytest.raises(ValueError):
+            store.scan_owners(limit=limit)
+    for page_number, page_size in ((-1, 2), (0, 0), (0, -3), ("1", 2)):
+        with pytest.raises(ValueError):
+            store.owners_page(page_number, page_size)
+    pairs, cursor = store.scan_owners(limit=1)
+    assert [owner for owner, _ in pairs] == ["Ash"] and cursor
+    assert [owner for owner, _ in store.owners_page(1, 2)] == ["Misty"]
+
+
+@pytest.mark.parametrize("store_factory", [OwnerStore, PersistentOwnerStore, SqliteOwnerStore])
+def test_evolve_without_next_species_changes_nothing(store_factory, monkeypatch):
+    # the last species marked evolvable has no next ID to evolve into
+    last = ex7.HOENN_DATA[-1]
+    monkeypatch.setitem(last, 'Can Evolve', "TRUE")
+    store = store_factory()
+    store.create_owner("Ash", "Treecko")
+    store.add_pokemon("Ash", last['ID'])
+    result, pokemon, evolution = store.evolve_pokemon("Ash", last['Name'])
+    assert (result, pokemon, evolution) == (ex7.RESULT_CANNOT_EVOLVE, last, None)
+    assert [poke['Name'] for poke in store.get_pokedex("Ash")] == ["Treecko", last['Name']]
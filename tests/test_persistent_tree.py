@@ -0,0 +1,45 @@
+import copy
+
+import ex7
+from persistent_tree import PersistentOwnerStore
+
+
+def test_snapshot_is_unchanged_by_later_writes():
+    store = PersistentOwnerStore()
+    # "Mew" ends up with two children, so deleting it copies its successor up
+    for name in ("Mew", "Dawn", "Tracey", "Ash", "Gary", "Red", "Zoe"):
+        store.create_owner(name, "Treecko")
+        store.add_pokemon(name, 4)
+    snap = store.snapshot()
+    before = copy.deepcopy(store.traverse(snapshot=snap))
+    before_sorted = store.sorted_owners(snapshot=snap)
+    root = snap['root']
+    assert root['owner'] == "Mew" and root['left'] and root['right']
+
+    store.create_owner("Brock", "Mudkip")
+    store.add_pokemon("Ash", 7)
+    store.release_pokemon("Gary", "Treecko")
+    store.evolve_pokemon("Dawn", "Treecko")
+    assert store.delete_owner("Mew") == ex7.RESULT_OK
+    assert store.delete_owner("zoe") == ex7.RESULT_OK
+
+    assert store.traverse(snapshot=snap) == before
+    assert store.owner_count(snap) == 7
+    assert store.sorted_owners(snapshot=snap) == before_sorted
+    assert store.get_pokedex("Mew", snapshot=snap)[0]['Name'] == "Treecko"
+    # and the current state has the changes
+    assert store.owner_count() == 6
+    assert store.get_pokedex("Mew") is None
+    assert [poke['Name'] for poke in store.get_pokedex("Ash")] == ["Treecko", "Torchic", "Mudkip"]
+
+
+def test_restore_brings_back_a_snapshot():
+    store = PersistentOwnerStore()
+    for name in ("Mew", "Dawn", "Tracey"):
+        store.create_owner(name, "Torchic")
+    snap = store.snapshot()
+    store.delete_owner("Mew")
+    store.add_pokemon("Dawn", 9)
+    store.restore(snap)
+    assert store.traverse() == store.traverse(snapshot=snap)
+    assert store.owner_count() == 3
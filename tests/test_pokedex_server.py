@@ -0,0 +1,191 @@
+import asyncio
+import json
+import threading
+
+import change_feed
+import ex7
+import pokedex_server
+from owner_store import OwnerStore
+
+
+async def _request(reader, writer, request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def _with_server(store, client):
+    server = await pokedex_server.start_server(store, port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        return await client(port)
+
+
+class _SlowSortStore(OwnerStore):
+    """
+    OwnerStore whose sorted_owners() blocks until released.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def sorted_owners(self):
+        self.release.wait(5)
+        return super().sorted_owners()
+
+
+def test_slow_query_does_not_stall_other_connections():
+    store = _SlowSortStore()
+    store.create_owner("Ash", "Treecko")
+
+    async def client(port):
+        slow_reader, slow_writer = await asyncio.open_connection("127.0.0.1", port)
+        slow_writer.write(json.dumps({"id": 1, "op": "sorted"}).encode() + b"\n")
+        await slow_writer.drain()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        # answered while the other connection's query is still running
+        response = await asyncio.wait_for(_request(reader, writer, {"id": 2, "op": "find", "owner": "ash"}), 2)
+        assert response["ok"] and not store.release.is_set()
+        store.release.set()
+        slow = json.loads(await slow_reader.readline())
+        assert slow["id"] == 1 and slow["owners"] == [["Ash", 1]]
+        for w in (slow_writer, writer):
+            w.close()
+            await w.wait_closed()
+
+    asyncio.run(_with_server(store, client))
+
+
+def test_line_too_long_gets_an_error():
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(json.dumps({"id": 1, "op": "sorted"}).encode() + b"\n")
+        writer.write(b"x" * (pokedex_server.MAX_LINE + 10) + b"\n")
+        await writer.drain()
+        first = json.loads(await reader.readline())
+        second = json.loads(await reader.readline())
+        assert first["id"] == 1 and first["ok"]
+        assert second == {"id": None, "ok": False, "error": "line too long"}
+        # then the server closes the connection
+        assert await reader.readline() == b""
+        writer.close()
+
+    asyncio.run(_with_server(OwnerStore(), client))
+
+
+def test_traverse_streams_every_owner():
+    store = OwnerStore()
+    names = [f"Owner{i:04d}" for i in range(3 * pokedex_server.TRAVERSE_CHUNK + 5)]
+    for i, name in enumerate(names):
+        store.create_owner(name, ex7.STARTERS[i % 3 + 1])
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1024 * 1024)
+        writer.write(json.dumps({"id": 7, "op": "traverse", "order": "in"}).encode() + b"\n")
+        await writer.drain()
+        owners = []
+        while True:
+            line = json.loads(await reader.readline())
+            if "ok" in line:
+                break
+            owners.append(line["owner"])
+        assert line == {"id": 7, "ok": True, "done": True, "count": len(names)}
+        assert owners == sorted(names)
+        writer.close()
+
+    asyncio.run(_with_server(store, client))
+
+
+def test_bad_scan_and_page_arguments_get_errors():
+    store = OwnerStore()
+    store.create_owner("Ash", "Treecko")
+    bad_requests = [
+        {"op": "scan", "limit": 0},
+        {"op": "scan", "limit": -2},
+        {"op": "scan", "limit": "5"},
+        {"op": "page", "page": -1, "size": 5},
+        {"op": "page", "page": 0, "size": 0},
+        {"op": "page", "page": "0", "size": 5},
+    ]
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        # pipelined: every request is answered, including the good one at the end
+        requests = bad_requests + [{"op": "scan", "limit": 1}]
+        for i, request in enumerate(requests):
+            writer.write(json.dumps(dict(request, id=i)).encode() + b"\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        assert [response["id"] for response in responses] == list(range(len(requests)))
+        assert not any(response["ok"] for response in responses[:-1])
+        assert responses[-1]["ok"] and responses[-1]["owners"][0]["owner"] == "Ash"
+        writer.close()
+
+    asyncio.run(_with_server(store, client))
+
+
+class _BrokenWalkStore(OwnerStore):
+    """
+    OwnerStore whose lazy traversal fails after the first owner.
+    """
+
+    def iter_traverse(self, order=ex7.PRINT_OWNER_IN):
+        for i, pair in enumerate(self.traverse(order)):
+            if i == 1:
+                raise ValueError("walk failed")
+            yield pair
+
+
+async def _pipeline(port, requests):
+    """
+    Send every request at once and return the final response line of each (in order).
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i, request in enumerate(requests):
+        writer.write(json.dumps(dict(request, id=i)).encode() + b"\n")
+    await writer.drain()
+    responses = []
+    while len(responses) < len(requests):
+        line = json.loads(await asyncio.wait_for(reader.readline(), 2))
+        # traversal lines without "ok" are partial results
+        if "ok" in line:
+            responses.append(line)
+    writer.close()
+    return responses
+
+
+def test_bad_traversals_are_answered_and_the_pipeline_continues():
+    store = _BrokenWalkStore()
+    for name in ("Ash", "Brock", "Misty"):
+        store.create_owner(name, "Treecko")
+    requests = [
+        {"op": "find", "owner": "Ash"},
+        {"op": "traverse", "order": ["in"]},
+        {"op": "traverse", "order": "sideways"},
+        {"op": "traverse", "order": "in"},
+        {"op": "find", "owner": "Misty"},
+    ]
+    responses = asyncio.run(_with_server(store, lambda port: _pipeline(port, requests)))
+    assert [response["id"] for response in responses] == [0, 1, 2, 3, 4]
+    assert [response["ok"] for response in responses] == [True, False, False, False, True]
+    assert responses[3]["error"] == "bad arguments: walk failed"
+
+
+def test_numeric_arguments_must_be_whole_numbers():
+    store = OwnerStore(feed=change_feed.ChangeFeed())
+    store.create_owner("Ash", "Treecko")
+    requests = [
+        {"op": "add", "owner": "Ash", "poke_id": "7"},
+        {"op": "add", "owner": "Ash", "poke_id": 7.9},
+        {"op": "add", "owner": "Ash"},
+        {"op": "changes", "since": "0"},
+        {"op": "changes", "since": 0, "limit": 1.5},
+        {"op": "changes", "since": -1},
+        {"op": "changes", "since": 0, "limit": 0},
+        {"op": "add", "owner": "Ash", "poke_id": 7},
+        {"op": "changes", "since": 0, "limit": 5},
+    ]
+    responses = asyncio.run(_with_server(store, lambda port: _pipeline(port, requests)))
+    assert [response["ok"] for response in responses] == [False] * 7 + [True, True]
+    assert [event["kind"] for event in responses[-1]["events"]] == ["create", "add"]
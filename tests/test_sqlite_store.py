@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+import types
+
+import pytest
+
+import ex7
+import sqlite_store
+from owner_store import OwnerStore
+from sqlite_store import SqliteOwnerStore
+
+
+def _load(stores):
+    for i in range(53):
+        name = f"Trainer{i:03d}"
+        for store in stores:
+            store.create_owner(name, ex7.STARTERS[i % 3 + 1])
+            for poke_id in range(i % 7, i % 7 + i % 5):
+                store.add_pokemon(name, poke_id + 1)
+            # some owners end up with an empty pokedex
+            if i % 4 == 0:
+                store.release_pokemon(name, ex7.STARTERS[i % 3 + 1])
+
+
+def test_whole_store_reads_are_lists_and_paged_generators(monkeypatch):
+    monkeypatch.setattr(sqlite_store, "OWNER_PAGE_SIZE", 10)
+    # species first for up to 1 in 4 species, in tiny pages that split owners' matches
+    monkeypatch.setattr(sqlite_store, "SPECIES_DRIVEN_SHARE", 4)
+    monkeypatch.setattr(sqlite_store, "FILTER_PAGE_ROWS", 3)
+    monkeypatch.setattr(sqlite_store, "FILTER_MAX_PASSES", 1000)
+    memory_store = OwnerStore()
+    with SqliteOwnerStore() as sql_store:
+        _load([memory_store, sql_store])
+        assert sql_store.traverse() == memory_store.traverse()
+        owners = sql_store.iter_traverse()
+        assert isinstance(owners, types.GeneratorType)
+        assert list(owners) == memory_store.traverse()
+        # owner first: all, evolvable, attack > 60; species first: attack > 100, water
+        for choice, value in ((ex7.DISP_ALL, None), (ex7.DISP_EVOLVABLE, None),
+                              (ex7.DISP_ATTACK_ABOVE, 60), (ex7.DISP_ATTACK_ABOVE, 100),
+                              (ex7.DISP_CERTAIN_TYPE, "WATER")):
+            expected = memory_store.filter_all_owners(choice, value)
+            assert sql_store.filter_all_owners(choice, value) == expected
+            matches = sql_store.iter_filter_all_owners(choice, value)
+            assert isinstance(matches, types.GeneratorType)
+            assert list(matches) == expected
+
+
+def test_traverse_does_not_hold_the_lock_between_pages(monkeypatch):
+    monkeypatch.setattr(sqlite_store, "OWNER_PAGE_SIZE", 10)
+    with SqliteOwnerStore() as sql_store:
+        _load([sql_store])
+        owners = sql_store.iter_traverse()
+        first = next(owners)
+        # writes from other threads can go ahead while a walk is paused
+        writer = threading.Thread(target=sql_store.create_owner, args=("Zed", "Torchic"))
+        writer.start()
+        writer.join(2)
+        assert not writer.is_alive()
+        rest = list(owners)
+        assert first[0] == "Trainer000" and rest[-1][0] == "Zed"
+
+
+def _writes_from_another_thread(store, owner_name):
+    # daemon, so a writer stuck on a leaked lock fails the test instead of hanging it
+    writer = threading.Thread(target=store.create_owner, args=(owner_name, "Torchic"), daemon=True)
+    writer.start()
+    writer.join(2)
+    return not writer.is_alive()
+
+
+def test_failed_begin_releases_the_lock(tmp_path):
+    path = str(tmp_path / "owners.db")
+    with SqliteOwnerStore(path) as first, SqliteOwnerStore(path, timeout=0.1) as second:
+        with first.batch():
+            first.create_owner("Ash", "Torchic")
+            # the file's write lock is taken, BEGIN IMMEDIATE fails
+            with pytest.raises(sqlite3.OperationalError):
+                second.create_owner("Brock", "Mudkip")
+        assert _writes_from_another_thread(second, "Misty")
+        assert second.sorted_owners() == [["Ash", 1], ["Misty", 1]]
+
+
+def test_failed_commit_rolls_back_and_releases_the_lock():
+    with SqliteOwnerStore() as store:
+        with pytest.raises(sqlite3.IntegrityError):
+            with store.batch():
+                # a deferred foreign key makes COMMIT itself fail
+                store._conn.execute("PRAGMA defer_foreign_keys = ON")
+                store.create_owner("Ash", "Torchic")
+                owner_id = store._owner_row("Ash")[0]
+                store._conn.execute(sqlite_store.SQL_INSERT_ENTRY, (owner_id, 5, 9999))
+        assert not store._conn.in_transaction
+        assert store.get_pokedex("Ash") is None
+        assert _writes_from_another_thread(store, "Misty")
+        assert store.owner_count() == 1